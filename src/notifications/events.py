@@ -1,7 +1,8 @@
 """Definition of typed notification events.
 
-Each event is an immutable dataclass to facilitate testing, serialization,
-and extension. The ``event_type`` method provides the key used by channels.
+Each event is an immutable, slotted dataclass (no per-instance ``__dict__``)
+to facilitate testing, serialization, and extension. The ``event_type``
+method provides the key used by channels.
 """
 
 from __future__ import annotations
@@ -11,7 +12,7 @@ from datetime import datetime
 from typing import Any, Dict, List
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NotificationEvent:
     timestamp: datetime = field(default_factory=lambda: datetime.now(), kw_only=True)
 
@@ -30,46 +31,46 @@ class NotificationEvent:
         return data
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunnerStarted(NotificationEvent):
     runner_name: str
     labels: List[str] | str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunnerStopped(NotificationEvent):
     runner_name: str
     uptime: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunnerRemoved(NotificationEvent):
     runner_id: str
     runner_name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunnerError(NotificationEvent):
     runner_id: str
     runner_name: str
     error_message: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunnerSkipped(NotificationEvent):
     runner_name: str
     operation: str
     reason: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BuildStarted(NotificationEvent):
     image_name: str
     dockerfile: str | None = None
     id: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BuildCompleted(NotificationEvent):
     image_name: str
     duration: float
@@ -78,14 +79,14 @@ class BuildCompleted(NotificationEvent):
     id: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BuildFailed(NotificationEvent):
     id: str | None
     image_name: str
     error_message: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ImageUpdated(NotificationEvent):
     runner_type: str
     from_version: str
@@ -93,7 +94,7 @@ class ImageUpdated(NotificationEvent):
     image_name: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UpdateAvailable(NotificationEvent):
     runner_type: str
     image_name: str
@@ -101,7 +102,7 @@ class UpdateAvailable(NotificationEvent):
     available_version: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UpdateApplied(NotificationEvent):
     runner_type: str
     from_version: str
@@ -109,7 +110,7 @@ class UpdateApplied(NotificationEvent):
     image_name: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UpdateError(NotificationEvent):
     runner_type: str
     error_message: str
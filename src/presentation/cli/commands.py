@@ -27,6 +27,13 @@ console = Console()
 webhook_app = typer.Typer(help="Commands to test and debug webhooks")
 
 
+@app.callback()
+def _deliver_notifications_on_exit(ctx: typer.Context) -> None:
+    # Les notifications partent en arrière-plan : attendre leur livraison
+    # avant que la commande ne rende la main
+    ctx.call_on_close(lambda: notification_service.flush())
+
+
 @app.command()
 def build_runners_images(quiet: bool = False, progress: bool = True) -> None:
     """Build custom Docker images for runners defined in the YAML config.
@@ -154,7 +154,7 @@ def test_webhooks(
             console.print("[yellow]Sending cancelled[/yellow]")
             return {"cancelled": True}
 
-    results = webhook_service.notify(
+    results = webhook_service.notify_sync(
         event_type, mock_data, provider if provider else None
     )
 
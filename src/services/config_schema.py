@@ -70,6 +70,14 @@ class TeamsTemplateConfig(BaseModel):
     sections: List[TeamsSection] = []
 
 
+class BackoffConfig(BaseModel):
+    """Exponential backoff between webhook retries."""
+
+    initial_ms: Optional[int] = Field(default=None, ge=0)  # Defaults to retry_delay
+    multiplier: float = Field(default=2, ge=1)
+    max_ms: int = Field(default=60000, ge=0)
+
+
 # Configuration Slack
 class SlackConfig(BaseModel):
     """Slack notification configuration."""
@@ -79,6 +87,9 @@ class SlackConfig(BaseModel):
     channel: str = ""  # Optional, can be defined in the webhook URL
     username: str = "GitHub Runner Manager"
     timeout: int = 10
+    max_concurrency: Optional[int] = Field(default=None, ge=1)  # workers // 2
+    max_queue: int = Field(default=100, ge=1)
+    backoff: Optional[BackoffConfig] = None
     events: List[str] = []
     templates: Dict[str, SlackTemplateConfig] = {}
 
@@ -92,6 +103,9 @@ class DiscordConfig(BaseModel):
     username: str = "GitHub Runner Manager"
     avatar_url: Optional[HttpUrl] = None
     timeout: int = 10
+    max_concurrency: Optional[int] = Field(default=None, ge=1)  # workers // 2
+    max_queue: int = Field(default=100, ge=1)
+    backoff: Optional[BackoffConfig] = None
     events: List[str] = []
     templates: Dict[str, DiscordTemplateConfig] = {}
 
@@ -103,6 +117,9 @@ class TeamsConfig(BaseModel):
     enabled: bool = False
     webhook_url: HttpUrl
     timeout: int = 10
+    max_concurrency: Optional[int] = Field(default=None, ge=1)  # workers // 2
+    max_queue: int = Field(default=100, ge=1)
+    backoff: Optional[BackoffConfig] = None
     events: List[str] = []
     templates: Dict[str, TeamsTemplateConfig] = {}
 
@@ -126,6 +143,9 @@ class WebhooksConfig(BaseModel):
     timeout: int = 10
     retry_count: int = 3
     retry_delay: int = 5
+    workers: int = Field(default=4, ge=1)
+    prewarm: bool = False
+    verbose_console: bool = False
     slack: Optional[SlackConfig] = None
     discord: Optional[DiscordConfig] = None
     teams: Optional[TeamsConfig] = None
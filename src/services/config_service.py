@@ -1,7 +1,7 @@
 """Simplified configuration service."""
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Tuple
 
 import yaml
 
@@ -13,16 +13,31 @@ class ConfigService:
 
     def __init__(self, path: str = "runners_config.yaml"):
         self._path = Path(path)
+        # ((inode, mtime_ns, size) of the file when parsed, parsed configuration)
+        self._cache: Optional[Tuple[Tuple[int, int, int], FullConfig]] = None
 
     def load_config(self) -> FullConfig:
         """
         Load and validate configuration from the YAML file.
+
+        The parsed configuration is reused as long as the file's inode, mtime
+        and size are unchanged (a file replaced with os.replace gets a new
+        inode); callers must not modify the returned object.
         """
-        if not self._path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {self._path}")
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Configuration file not found: {self._path}"
+            ) from None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._cache is not None and self._cache[0] == key:
+            return self._cache[1]
         with self._path.open("r", encoding="utf-8") as f:
             raw = yaml.safe_load(f) or {}
-        return FullConfig.model_validate(raw)
+        config = FullConfig.model_validate(raw)
+        self._cache = (key, config)
+        return config
 
     def save_config(self, config: Any) -> None:
         """
@@ -30,6 +45,7 @@ class ConfigService:
         """
         if hasattr(config, "model_dump"):
             config = config.model_dump()
+        self._cache = None
         with self._path.open("w", encoding="utf-8") as f:
             yaml.dump(config, f, default_flow_style=False)
 
@@ -1,15 +1,18 @@
 """Docker service for managing GitHub Actions runners."""
 
+import contextlib
 import os
 import re
 import shutil
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import docker
 import requests
+from docker.utils.json_stream import json_stream
 from rich.console import Console
 from rich.progress import (
     BarColumn,
@@ -24,6 +27,10 @@ from src.services.docker_logger import DockerBuildLogger
 
 
 class DockerService:
+    # Durée de validité (secondes) des résultats mis en cache
+    IMAGE_CACHE_TTL = 60
+    VERSION_CACHE_TTL = 300
+
     def _get_registration_token(
         self, org_url: str, github_personal_token: Optional[str] = None
     ) -> str:
@@ -62,8 +69,13 @@ class DockerService:
             f"Impossible d'obtenir un registration token GitHub: {resp.text}"
         )
 
-    def __init__(self, config_service: ConfigService):
+    def __init__(self, config_service: ConfigService, max_workers: int = 8):
         self.config_service = config_service
+        # Concurrent Docker calls when stopping/removing runners (1 = sequential)
+        self.max_workers = max_workers
+        # {image tag: (timestamp, exists)} and {url: (timestamp, version, etag)}
+        self._image_cache: Dict[str, tuple] = {}
+        self._version_cache: Dict[str, tuple] = {}
 
     def container_exists(self, name: str) -> bool:
         """Check if a container exists (docker-py)."""
@@ -93,14 +105,23 @@ class DockerService:
         subprocess.run(cmd, check=True)
 
     def image_exists(self, tag: str) -> bool:
-        """Check if a Docker image exists (docker-py)."""
+        """Check if a Docker image exists (docker-py).
+
+        Answers are cached for IMAGE_CACHE_TTL seconds; build_image busts the
+        entry of the tag it builds.
+        """
 
+        cached = self._image_cache.get(tag)
+        if cached and time.monotonic() - cached[0] < self.IMAGE_CACHE_TTL:
+            return cached[1]
         client = docker.from_env()
         try:
             images = client.images.list(name=tag)
-            return len(images) > 0
         except Exception:
             return False
+        exists = len(images) > 0
+        self._image_cache[tag] = (time.monotonic(), exists)
+        return exists
 
     def build_image(
         self,
@@ -114,18 +135,22 @@ class DockerService:
     ) -> None:
         """Build a Docker image (docker-py)."""
 
+        self._image_cache.pop(image_tag, None)
         client = docker.from_env()
         buildargs = build_args or {}
         api_client = client.api
         dockerfile_rel = os.path.relpath(dockerfile_path, build_dir)
-        stream = api_client.build(
+        response = api_client.build(
             path=build_dir,
             dockerfile=dockerfile_rel,
             tag=image_tag,
             buildargs=buildargs,
             rm=True,
-            decode=True,
+            decode=False,
         )
+        # Equivalent to decode=True, which runs this same json_stream inside
+        # docker-py: the build output is parsed into one dict per JSON object
+        stream = json_stream(response)
 
         # Use DockerBuildLogger if no custom logger provided
         if logger is None:
@@ -185,8 +210,8 @@ class DockerService:
                         progress.update(task_id, completed=progress.tasks[0].total)
             finally:
                 try:
-                    if hasattr(stream, "close"):
-                        stream.close()
+                    if hasattr(response, "close"):
+                        response.close()
                 except Exception:
                     pass
             return
@@ -194,7 +219,7 @@ class DockerService:
         # Iterate over the stream and log progress lines
         try:
             for chunk in stream:
-                # chunk is expected to be a dict when decode=True
+                # chunk is a decoded JSON object, normally a dict
                 if not chunk:
                     continue
                 # Some messages contain 'stream' (plain text), others 'status' and 'progress'
@@ -219,8 +244,8 @@ class DockerService:
         finally:
             # ensure generator is exhausted/closed
             try:
-                if hasattr(stream, "close"):
-                    stream.close()
+                if hasattr(response, "close"):
+                    response.close()
             except Exception:
                 pass
 
@@ -290,6 +315,27 @@ class DockerService:
             return [name for name in names if name_pattern in name]
         return names
 
+    def _snapshot_containers(self, name_pattern: str) -> Dict[str, Dict[str, Any]]:
+        """Snapshot the containers whose name contains name_pattern (docker-py).
+
+        One Docker call answers every existence/running question of a runner
+        group: names missing from the result do not exist. Errors yield an
+        empty snapshot, as container_exists() reports False on errors.
+        """
+
+        client = docker.from_env()
+        try:
+            containers = client.containers.list(
+                all=True, filters={"name": name_pattern}
+            )
+        except Exception:
+            return {}
+        return {
+            c.name: {"exists": True, "running": c.status == "running", "id": c.id}
+            for c in containers
+            if name_pattern in c.name
+        }
+
     def build_runner_images(
         self, quiet: bool = False, use_progress: bool = False
     ) -> dict:
@@ -299,8 +345,7 @@ class DockerService:
         defaults = config.runners_defaults
         base_image_default = defaults.base_image
 
-        m = re.search(r":([\d.]+)$", base_image_default)
-        runner_version = m.group(1) if m else "latest"
+        runner_version = self._runner_version(base_image_default)
 
         result: dict[str, list[dict[str, str]]] = {
             "built": [],
@@ -329,7 +374,7 @@ class DockerService:
                 continue
 
             try:
-                image_tag = f"{techno}:{techno_version}-{runner_version}"
+                image_tag = self._expected_image_tag(runner, runner_version)
                 build_dir = os.path.dirname(build_image) or "."
                 dockerfile_path = build_image
 
@@ -380,8 +425,7 @@ class DockerService:
         org_url_default = defaults.org_url
         runners = config.runners
 
-        m = re.search(r":([\d.]+)$", base_image_default)
-        runner_version = m.group(1) if m else "latest"
+        runner_version = self._runner_version(base_image_default)
 
         result: dict[str, list[dict[str, str]]] = {
             "started": [],
@@ -400,10 +444,9 @@ class DockerService:
             techno_version = getattr(runner, "techno_version", None)
             base_image = getattr(runner, "base_image", base_image_default)
             org_url = getattr(runner, "org_url", org_url_default)
-            if build_image and techno and techno_version:
-                image = f"{techno}:{techno_version}-{runner_version}"
-            else:
-                image = f"{prefix}:latest"
+            image = self._expected_image_tag(runner, runner_version)
+            # Constantes du groupe, calculées une fois pour tous ses runners
+            labels_str = ",".join(labels) if isinstance(labels, list) else labels
 
             if build_image and not self.image_exists(image):
                 try:
@@ -428,8 +471,8 @@ class DockerService:
                     )
                     continue
 
-            all_containers = self.list_containers(prefix + "-")
-            for name in all_containers:
+            containers = self._snapshot_containers(prefix + "-")
+            for name, state in containers.items():
                 try:
                     parts = name.split("-")
                     if len(parts) < 2:
@@ -437,7 +480,7 @@ class DockerService:
                     idx = int(parts[-1])
                     if idx > nb:
                         try:
-                            if not self.container_running(name):
+                            if not state["running"]:
                                 self.start_container(name)
                             self.exec_command(
                                 name,
@@ -457,8 +500,9 @@ class DockerService:
 
             for i in range(1, nb + 1):
                 runner_name = f"{prefix}-{i}"
+                state = containers.get(runner_name)
                 try:
-                    if self.container_exists(runner_name):
+                    if state:
                         # Vérifier si l'image du container correspond à l'image attendue
                         client = docker.from_env()
                         container = client.containers.get(runner_name)
@@ -466,7 +510,7 @@ class DockerService:
                             container.image.tags[0] if container.image.tags else None
                         )
                         if current_image != image:
-                            if self.container_running(runner_name):
+                            if state["running"]:
                                 self.stop_container(runner_name)
                             try:
                                 self.exec_command(
@@ -476,33 +520,7 @@ class DockerService:
                             except Exception:
                                 pass
                             self.remove_container(runner_name, force=True)
-                            registration_token = self._get_registration_token(
-                                org_url, None
-                            )
-                            env_vars = {
-                                "RUNNER_NAME": runner_name,
-                                "RUNNER_REPO": org_url,
-                                "RUNNER_TOKEN": registration_token,
-                                "RUNNER_LABELS": (
-                                    ",".join(labels)
-                                    if isinstance(labels, list)
-                                    else labels
-                                ),
-                            }
-                            command = (
-                                f"if [ ! -f .runner ]; then "
-                                f"./config.sh --url {org_url} --token {registration_token} "
-                                f"--name {runner_name} "
-                                f"--labels {','.join(labels) if isinstance(labels, list) else labels} "
-                                f"--unattended; "
-                                f"fi && ./run.sh"
-                            )
-                            self.run_container(
-                                name=runner_name,
-                                image=image,
-                                command=command,
-                                env_vars=env_vars,
-                            )
+                            self._launch_runner(runner_name, image, org_url, labels_str)
                             result["started"].append(
                                 {
                                     "name": runner_name,
@@ -511,7 +529,7 @@ class DockerService:
                                 }
                             )
                         else:
-                            if self.container_running(runner_name):
+                            if state["running"]:
                                 result["running"].append(
                                     {"name": runner_name, "labels": labels}
                                 )
@@ -521,28 +539,7 @@ class DockerService:
                                     {"name": runner_name, "labels": labels}
                                 )
                     else:
-                        registration_token = self._get_registration_token(org_url, None)
-                        env_vars = {
-                            "RUNNER_NAME": runner_name,
-                            "RUNNER_REPO": org_url,
-                            "RUNNER_TOKEN": registration_token,
-                            "RUNNER_LABELS": (
-                                ",".join(labels) if isinstance(labels, list) else labels
-                            ),
-                        }
-                        command = (
-                            f"if [ ! -f .runner ]; then "
-                            f"./config.sh --url {org_url} --token {registration_token} "
-                            f"--name {runner_name} --labels {','.join(labels) if isinstance(labels, list) else labels} "
-                            f"--unattended; "
-                            f"fi && ./run.sh"
-                        )
-                        self.run_container(
-                            name=runner_name,
-                            image=image,
-                            command=command,
-                            env_vars=env_vars,
-                        )
+                        self._launch_runner(runner_name, image, org_url, labels_str)
                         result["started"].append(
                             {"name": runner_name, "labels": labels}
                         )
@@ -553,6 +550,31 @@ class DockerService:
 
         return result
 
+    def _launch_runner(
+        self, runner_name: str, image: str, org_url: str, labels: str
+    ) -> None:
+        # Register and run one runner container; labels are already joined
+        registration_token = self._get_registration_token(org_url, None)
+        env_vars = {
+            "RUNNER_NAME": runner_name,
+            "RUNNER_REPO": org_url,
+            "RUNNER_TOKEN": registration_token,
+            "RUNNER_LABELS": labels,
+        }
+        command = (
+            f"if [ ! -f .runner ]; then "
+            f"./config.sh --url {org_url} --token {registration_token} "
+            f"--name {runner_name} --labels {labels} "
+            f"--unattended; "
+            f"fi && ./run.sh"
+        )
+        self.run_container(
+            name=runner_name,
+            image=image,
+            command=command,
+            env_vars=env_vars,
+        )
+
     def stop_runners(self) -> dict:
         """Stop Docker runners according to the configuration."""
         config = self.config_service.load_config()
@@ -564,25 +586,23 @@ class DockerService:
             "errors": [],
         }
 
-        for runner in runners:
-            prefix = runner.name_prefix
-            nb = runner.nb
-
-            for i in range(1, nb + 1):
-                runner_name = f"{prefix}-{i}"
-                try:
-                    if self.container_running(runner_name):
-                        self.stop_container(runner_name)
-                        result["stopped"].append({"name": runner_name})
-                    else:
-                        result["skipped"].append(
-                            {"name": runner_name, "reason": "Not running"}
-                        )
-                except Exception as e:
-                    result["errors"].append({"name": runner_name, "reason": str(e)})
+        for bucket, entry in self._run_parallel(
+            self._stop_one, self._runner_states(runners)
+        ):
+            result[bucket].append(entry)
 
         return result
 
+    def _stop_one(self, runner_name: str, state: Optional[dict]) -> tuple:
+        # Stop one runner; returns the result bucket and its entry
+        try:
+            if state and state["running"]:
+                self.stop_container(runner_name)
+                return "stopped", {"name": runner_name}
+            return "skipped", {"name": runner_name, "reason": "Not running"}
+        except Exception as e:
+            return "errors", {"name": runner_name, "reason": str(e)}
+
     def remove_runners(self) -> dict:
         """Remove Docker runners according to the configuration."""
         config = self.config_service.load_config()
@@ -594,30 +614,49 @@ class DockerService:
             "errors": [],
         }
 
+        for bucket, entry in self._run_parallel(
+            self._remove_one, self._runner_states(runners)
+        ):
+            result[bucket].append(entry)
+
+        return result
+
+    def _remove_one(self, runner_name: str, state: Optional[dict]) -> tuple:
+        # Unregister and remove one runner; returns the result bucket and its entry
+        try:
+            if not state:
+                return "skipped", {"name": runner_name, "reason": "Container not found"}
+            if not state["running"]:
+                self.start_container(runner_name)
+            self.exec_command(
+                runner_name,
+                'bash -c "./config.sh remove --token $RUNNER_TOKEN || true"',
+            )
+            self.remove_container(runner_name, force=True)
+            return "removed", {"container": runner_name}
+        except Exception as e:
+            return "errors", {"name": runner_name, "reason": str(e)}
+
+    def _runner_states(self, runners) -> list:
+        # (name, snapshot state or None) of every configured runner, in order
+        jobs = []
         for runner in runners:
             prefix = runner.name_prefix
-            nb = runner.nb
-
-            for i in range(1, nb + 1):
+            containers = self._snapshot_containers(prefix + "-")
+            for i in range(1, runner.nb + 1):
                 runner_name = f"{prefix}-{i}"
-                try:
-                    if self.container_exists(runner_name):
-                        if not self.container_running(runner_name):
-                            self.start_container(runner_name)
-                        self.exec_command(
-                            runner_name,
-                            'bash -c "./config.sh remove --token $RUNNER_TOKEN || true"',
-                        )
-                        self.remove_container(runner_name, force=True)
-                        result["removed"].append({"container": runner_name})
-                    else:
-                        result["skipped"].append(
-                            {"name": runner_name, "reason": "Container not found"}
-                        )
-                except Exception as e:
-                    result["errors"].append({"name": runner_name, "reason": str(e)})
-
-        return result
+                jobs.append((runner_name, containers.get(runner_name)))
+        return jobs
+
+    def _run_parallel(self, func, jobs: list) -> list:
+        # Docker calls are I/O-bound: spread them over a small thread pool.
+        # map() keeps submission order, so reports stay deterministic.
+        if self.max_workers <= 1 or len(jobs) <= 1:
+            return [func(*job) for job in jobs]
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(jobs)), thread_name_prefix="docker"
+        ) as executor:
+            return list(executor.map(lambda job: func(*job), jobs))
 
     def list_runners(self) -> dict:
         """List Docker runners with their status."""
@@ -641,14 +680,15 @@ class DockerService:
                 "extra_runners": [],
             }
 
-            all_containers = self.list_containers(prefix + "-")
+            containers = self._snapshot_containers(prefix + "-")
 
             for i in range(1, nb + 1):
                 runner_name = f"{prefix}-{i}"
+                state = containers.get(runner_name)
 
                 status = "absent"
-                if self.container_exists(runner_name):
-                    if self.container_running(runner_name):
+                if state:
+                    if state["running"]:
                         status = "running"
                         group_info["running"] += 1
                         result["total"]["running"] += 1
@@ -659,7 +699,7 @@ class DockerService:
                     {"id": i, "name": runner_name, "status": status, "labels": labels}
                 )
 
-            for name in all_containers:
+            for name, state in containers.items():
                 try:
                     parts = name.split("-")
                     if len(parts) < 2:
@@ -667,7 +707,7 @@ class DockerService:
                     idx = int(parts[-1])
                     if idx > nb:
                         status = "will_be_removed"
-                        if self.container_running(name):
+                        if state["running"]:
                             status = "running_will_be_removed"
 
                         group_info["extra_runners"].append(
@@ -682,21 +722,38 @@ class DockerService:
         return result
 
     def get_latest_runner_version(self) -> Optional[str]:
-        """Retrieve the latest GitHub runner version via the GitHub API."""
-
+        """Retrieve the latest GitHub runner version via the GitHub API.
+
+        A version found is cached for VERSION_CACHE_TTL seconds; failures are
+        not cached, the next call asks the API again. Once the TTL expires the
+        release is revalidated with its ETag: a 304 answer carries no body.
+        """
+
+        url = "https://api.github.com/repos/actions/runner/releases/latest"
+        cached = self._version_cache.get(url)
+        if cached and time.monotonic() - cached[0] < self.VERSION_CACHE_TTL:
+            return cached[1]
+        headers = {"If-None-Match": cached[2]} if cached and cached[2] else {}
         try:
-            url = "https://api.github.com/repos/actions/runner/releases/latest"
-            resp = requests.get(url, timeout=10)
+            resp = requests.get(url, headers=headers, timeout=10)
+            if cached and resp.status_code == 304:
+                self._version_cache[url] = (time.monotonic(), *cached[1:])
+                return cached[1]
             resp.raise_for_status()
             data = resp.json()
             tag = data.get("tag_name")
-            if isinstance(tag, str):
-                if tag.startswith("v"):
-                    return tag[1:]
-                return tag
-            return None
         except Exception:
             return None
+        if not isinstance(tag, str):
+            return None
+        version = tag[1:] if tag.startswith("v") else tag
+        self._version_cache[url] = (time.monotonic(), version, resp.headers.get("ETag"))
+        return version
+
+    def clear_version_cache(self) -> None:
+        """Forget the cached runner versions and image lookups."""
+        self._version_cache.clear()
+        self._image_cache.clear()
 
     def check_base_image_update(
         self, config_path: str = "runners_config.yaml", auto_update: bool = False
@@ -746,12 +803,29 @@ class DockerService:
                 with open(config_path, "r") as f:
                     lines = f.readlines()
 
-                with open(config_path, "w") as f:
-                    for line in lines:
-                        if line.strip().startswith("base_image:"):
-                            f.write(f"  base_image: {new_image}\n")
-                        else:
-                            f.write(line)
+                # Réécriture ligne à ligne (commentaires et mise en forme
+                # conservés) dans un fichier temporaire, puis remplacement
+                # atomique : un échec ne laisse jamais de config tronquée.
+                # La cible est le fichier réel (lien symbolique conservé) et
+                # ses permissions sont reportées sur le fichier temporaire
+                target = os.path.realpath(config_path)
+                tmp_path = f"{target}.tmp"
+                try:
+                    with open(tmp_path, "w") as f:
+                        f.writelines(
+                            (
+                                f"  base_image: {new_image}\n"
+                                if line.strip().startswith("base_image:")
+                                else line
+                            )
+                            for line in lines
+                        )
+                    shutil.copymode(target, tmp_path)
+                    os.replace(tmp_path, target)
+                except BaseException:
+                    with contextlib.suppress(OSError):
+                        os.remove(tmp_path)
+                    raise
 
                 result["updated"] = True
                 result["new_image"] = new_image
@@ -767,3 +841,17 @@ class DockerService:
                 return f"{size_bytes:.2f} {unit}"
             size_bytes /= 1024
         return f"{size_bytes:.2f} PB"
+
+    def _runner_version(self, base_image: str) -> str:
+        # Runner version taken from the base image tag, "latest" if untagged
+        m = re.search(r":([\d.]+)$", base_image)
+        return m.group(1) if m else "latest"
+
+    def _expected_image_tag(self, runner, runner_version: str) -> str:
+        # Image a runner group runs on: the custom build when one is
+        # configured, else the group's own "<prefix>:latest" image
+        techno = getattr(runner, "techno", None)
+        techno_version = getattr(runner, "techno_version", None)
+        if getattr(runner, "build_image", None) and techno and techno_version:
+            return f"{techno}:{techno_version}-{runner_version}"
+        return f"{runner.name_prefix}:latest"
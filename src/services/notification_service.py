@@ -51,6 +51,16 @@ class NotificationService:
             if self.webhook_service.enabled:
                 build_and_register(self.webhook_service)
 
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait for the notifications sent so far to be delivered."""
+        if self.webhook_service is not None:
+            self.webhook_service.flush(timeout=timeout)
+
+    def close(self) -> None:
+        """Deliver pending notifications and release the webhook workers."""
+        if self.webhook_service is not None:
+            self.webhook_service.close()
+
     # --- Nouvelles primitives internes ----------------------------------
     def _emit(self, events: Iterable):  # events: Iterable[NotificationEvent]
         if not self.webhook_service or not self.webhook_service.enabled:
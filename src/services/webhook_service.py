@@ -5,9 +5,13 @@ services such as Slack, Discord, Microsoft Teams, etc.
 """
 
 import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import requests
 from rich.console import Console
@@ -27,6 +31,19 @@ class WebhookProvider(Enum):
         return self.value
 
 
+_SLACK, _DISCORD, _TEAMS, _GENERIC = (p.value for p in WebhookProvider)
+_PROVIDER_NAMES = (_SLACK, _DISCORD, _TEAMS, _GENERIC)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_DEFAULT_USERNAME = "GitHub Runner Manager"
+_DEFAULT_SLACK_COLOR = "#36a64f"  # Green
+_DEFAULT_DISCORD_COLOR = 3066993  # Green in decimal
+_DEFAULT_TEAMS_COLOR = "0076D7"  # Blue
+
+PayloadRenderer = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
 class WebhookService:
     """Unified service for managing outgoing webhooks."""
 
@@ -44,8 +61,27 @@ class WebhookService:
         self.timeout = self.config.get("timeout", 10)
         self.retry_count = self.config.get("retry_count", 3)
         self.retry_delay = self.config.get("retry_delay", 5)
+        self.workers = self.config.get("workers", 4)
+        self.prewarm = self.config.get("prewarm", False)
+        self._verbose = bool(self.config.get("verbose_console", False))
 
         self.providers = {}
+        # Per-provider bulkhead: a bounded queue of deliveries, drained by at
+        # most max_concurrency workers so a slow provider cannot take the pool
+        self._queues: Dict[str, deque] = {}
+        self._queue_limits: Dict[str, int] = {}
+        self._concurrency: Dict[str, int] = {}
+        self._draining: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._provider_events: Dict[str, FrozenSet[str]] = {}
+        self._event_index: Dict[str, List[str]] = defaultdict(list)
+        self._renderers: Dict[Tuple[str, str], PayloadRenderer] = {}
+        # Worker pool and HTTP session are created on first use, so a
+        # disabled service never starts threads nor opens connections
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._session: Optional[requests.Session] = None
+        self._closed = False
+        self._pending: Set[Future] = set()
 
         if self.enabled:
             self._init_providers()
@@ -53,23 +89,83 @@ class WebhookService:
     def _init_providers(self):
         """Initialize configured webhook providers."""
         # Iterate over known providers
-        for provider_name in WebhookProvider:
-            provider_config = self.config.get(provider_name.value)
+        for provider_name in _PROVIDER_NAMES:
+            provider_config = self.config.get(provider_name)
 
             # If the provider is configured and enabled
             if provider_config and provider_config.get("enabled", False):
                 self.console.print(
-                    f"[green]Initializing webhook provider [bold]{provider_name.value}[/bold][/green]"
+                    f"[green]Initializing webhook provider [bold]{provider_name}[/bold][/green]"
                 )
 
                 # Store the provider configuration
-                self.providers[provider_name.value] = provider_config
+                self.providers[provider_name] = provider_config
+                self._provider_events[provider_name] = frozenset(
+                    provider_config.get("events", ())
+                )
+                for event in self._provider_events[provider_name]:
+                    self._event_index[event].append(provider_name)
+                    self._renderers[(provider_name, event)] = self._compile_payload(
+                        provider_name, event, provider_config
+                    )
+                # Bound the workers a single (possibly slow) provider can hold;
+                # by default half of the pool, so the others always keep some
+                self._queues[provider_name] = deque()
+                self._queue_limits[provider_name] = provider_config.get(
+                    "max_queue", 100
+                )
+                self._concurrency[provider_name] = provider_config.get(
+                    "max_concurrency"
+                ) or max(1, self.workers // 2)
+                self._draining[provider_name] = 0
+
+                webhook_url = provider_config.get("webhook_url")
+                if self.prewarm and webhook_url:
+                    self._get_executor().submit(
+                        self._prewarm_connection, str(webhook_url)
+                    )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the delivery worker pool, starting it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="webhook"
+            )
+        return self._executor
+
+    def _get_session(self) -> requests.Session:
+        """Return the shared HTTP session, opening it on first use.
+
+        Deliveries reuse its pooled keep-alive connections.
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+            return self._session
+
+    def _prewarm_connection(self, url: str) -> None:
+        """
+        Open a pooled connection to a webhook host ahead of the first event.
+
+        Resolves DNS and completes the TLS handshake with a HEAD request so the
+        first notification does not pay for them. Failures are only logged.
+
+        Args:
+            url: Webhook URL
+        """
+        try:
+            self._get_session().head(url, timeout=2)
+        except Exception as e:
+            logger.debug(f"Connection pre-warm failed for {url}: {str(e)}")
 
     def notify(
         self, event_type: str, data: Dict[str, Any], provider: Optional[str] = None
-    ) -> Dict[str, bool]:
+    ) -> Dict[str, Future]:
         """
-        Send a notification to all providers configured for this event.
+        Queue a notification for all providers configured for this event.
+
+        Delivery happens on the background worker pool, so this method returns
+        without waiting for the network calls.
 
         Args:
             event_type: Event type to notify (runner_started, build_failed, etc.)
@@ -77,46 +173,183 @@ class WebhookService:
             provider: Specific provider to use (optional)
 
         Returns:
-            Dictionary with providers as keys and statuses as values
+            Dictionary with providers as keys and pending deliveries as values
         """
         if not self.enabled:
             logger.info("Service webhook désactivé, notification ignorée")
             return {}
+        if self._closed:
+            logger.warning(f"Webhook service closed, notification {event_type} ignored")
+            return {}
 
-        results = {}
+        futures = {}
 
-        # Filter the provider if specified
-        providers_to_use = {}
+        # Only providers subscribed to this event, optionally filtered
         if provider:
-            if provider in self.providers:
-                providers_to_use = {provider: self.providers[provider]}
-            else:
+            if provider not in self.providers:
                 self.console.print(
                     f"[yellow]Provider webhook [bold]{provider}[/bold] not configured[/yellow]"
                 )
                 return {}
+            subscribed = event_type in self._provider_events[provider]
+            candidates = [provider] if subscribed else []
         else:
-            providers_to_use = self.providers
+            candidates = self._event_index.get(event_type, [])
+
+        for provider_name in candidates:
+            futures[provider_name] = self._enqueue(
+                provider_name, event_type, dict(data), self.providers[provider_name]
+            )
+
+        return futures
+
+    def _enqueue(
+        self,
+        provider: str,
+        event_type: str,
+        data: Dict[str, Any],
+        config: Dict[str, Any],
+    ) -> Future:
+        """
+        Queue a delivery on the provider's bulkhead.
+
+        A worker is started for the provider only while it holds fewer than
+        max_concurrency of them; otherwise the delivery waits in the provider
+        queue. Only a full queue drops the delivery.
+
+        Args:
+            provider: Provider name (slack, discord, teams, etc.)
+            event_type: Event type to notify
+            data: Data to include in the notification
+            config: Provider configuration
 
-        for provider_name, provider_config in providers_to_use.items():
-            if event_type in provider_config.get("events", []):
-                success = self._send_notification(
-                    provider_name, event_type, data, provider_config
+        Returns:
+            Future resolved with the delivery status
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                logger.warning(
+                    f"Webhook service closed, notification {event_type} ignored"
                 )
-                results[provider_name] = success
+                future.set_result(False)
+                return future
+            queue = self._queues[provider]
+            if len(queue) >= self._queue_limits[provider]:
+                logger.warning(
+                    f"Notification queue full for provider {provider}, "
+                    f"dropping {event_type}"
+                )
+                future.set_result(False)
+                return future
+            queue.append((future, event_type, data, config))
+            self._pending.add(future)
+            if self._draining[provider] < self._concurrency[provider]:
+                self._draining[provider] += 1
+                # Submitted under the lock: close() cannot shut the pool
+                # down between the closed check and this call
+                self._get_executor().submit(self._drain, provider)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    def _drain(self, provider: str) -> None:
+        """
+        Deliver the queued notifications of a provider (worker side).
 
-                if success:
-                    self.console.print(
-                        f"[green]Notification [bold]{event_type}[/bold] "
-                        f"sent to [bold]{provider_name}[/bold][/green]"
-                    )
-                else:
-                    self.console.print(
-                        f"[red]Failed to send notification [bold]"
-                        f"{event_type}[/bold] via [bold]{provider_name}[/bold][/red]"
-                    )
+        Args:
+            provider: Provider name (slack, discord, teams, etc.)
+        """
+        while True:
+            with self._lock:
+                queue = self._queues[provider]
+                if not queue:
+                    self._draining[provider] -= 1
+                    return
+                future, event_type, data, config = queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._deliver(provider, event_type, data, config))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def notify_sync(
+        self, event_type: str, data: Dict[str, Any], provider: Optional[str] = None
+    ) -> Dict[str, bool]:
+        """
+        Send a notification and wait for every provider to answer.
+
+        Args:
+            event_type: Event type to notify (runner_started, build_failed, etc.)
+            data: Data to include in the notification
+            provider: Specific provider to use (optional)
+
+        Returns:
+            Dictionary with providers as keys and statuses as values
+        """
+        futures = self.notify(event_type, data, provider)
+        return {name: future.result() for name, future in futures.items()}
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait for the notifications queued so far, keeping the workers alive."""
+        wait(list(self._pending), timeout=timeout)
+
+    def close(self) -> None:
+        """Wait for queued notifications to be delivered and stop the workers.
+
+        Notifications sent afterwards are logged and ignored.
+        """
+        with self._lock:
+            self._closed = True
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if self._session is not None:
+            self._session.close()
+
+    def __enter__(self) -> "WebhookService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _deliver(
+        self,
+        provider: str,
+        event_type: str,
+        data: Dict[str, Any],
+        config: Dict[str, Any],
+    ) -> bool:
+        """
+        Deliver a queued notification and report its status (worker side).
 
-        return results
+        Args:
+            provider: Provider name (slack, discord, teams, etc.)
+            event_type: Event type to notify
+            data: Data to include in the notification
+            config: Provider configuration
+
+        Returns:
+            True if the send succeeded, False otherwise
+        """
+        success = self._send_notification(provider, event_type, data, config)
+
+        if success:
+            logger.info(f"Notification {event_type} sent to {provider}")
+            if self._verbose:
+                self.console.print(
+                    f"[green]Notification [bold]{event_type}[/bold] "
+                    f"sent to [bold]{provider}[/bold][/green]"
+                )
+        else:
+            logger.warning(f"Failed to send notification {event_type} via {provider}")
+            if self._verbose:
+                self.console.print(
+                    f"[red]Failed to send notification [bold]"
+                    f"{event_type}[/bold] via [bold]{provider}[/bold][/red]"
+                )
+
+        return success
 
     def _send_notification(
         self,
@@ -143,12 +376,19 @@ class WebhookService:
                 logger.error(f"Missing webhook URL for provider {provider}")
                 return False
 
+            # Templates of configured providers are compiled once at init
+            renderer = None
+            if config is self.providers.get(provider):
+                renderer = self._renderers.get((provider, event_type))
+
             payload = None
-            if provider == WebhookProvider.SLACK.value:
+            if renderer is not None:
+                payload = renderer(data)
+            elif provider == _SLACK:
                 payload = self._format_slack_payload(event_type, data, config)
-            elif provider == WebhookProvider.DISCORD.value:
+            elif provider == _DISCORD:
                 payload = self._format_discord_payload(event_type, data, config)
-            elif provider == WebhookProvider.TEAMS.value:
+            elif provider == _TEAMS:
                 payload = self._format_teams_payload(event_type, data, config)
             else:
                 payload = self._format_generic_payload(event_type, data, config)
@@ -175,14 +415,11 @@ class WebhookService:
         """
         provider_timeout = config.get("timeout", self.timeout)
         retry_count = self.retry_count
-        retry_delay = self.retry_delay
-
-        headers = {"Content-Type": "application/json"}
 
         for attempt in range(retry_count + 1):
             try:
-                response = requests.post(
-                    url, json=payload, headers=headers, timeout=provider_timeout
+                response = self._get_session().post(
+                    url, json=payload, headers=_JSON_HEADERS, timeout=provider_timeout
                 )
 
                 if 200 <= response.status_code < 300:
@@ -195,9 +432,7 @@ class WebhookService:
 
                 # Wait before retrying, except for the last attempt
                 if attempt < retry_count:
-                    import time
-
-                    time.sleep(retry_delay)
+                    time.sleep(self._backoff_delay(attempt, config))
 
             except Exception as e:
                 logger.warning(
@@ -206,6 +441,46 @@ class WebhookService:
 
         return False
 
+    def _backoff_delay(self, attempt: int, config: Dict[str, Any]) -> float:
+        """
+        Compute the delay before the next attempt (exponential, capped).
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            config: Provider configuration (optional 'backoff' section)
+
+        Returns:
+            Delay in seconds
+        """
+        backoff = config.get("backoff") or {}
+        initial_ms = backoff.get("initial_ms")
+        base = self.retry_delay if initial_ms is None else initial_ms / 1000
+        multiplier = backoff.get("multiplier", 2)
+        cap = backoff.get("max_ms", 60000) / 1000
+        return min(cap, base * multiplier**attempt)
+
+    def _compile_payload(
+        self, provider: str, event_type: str, config: Dict[str, Any]
+    ) -> PayloadRenderer:
+        """
+        Compile the payload renderer of a provider for an event type.
+
+        Args:
+            provider: Provider name (slack, discord, teams, etc.)
+            event_type: Event type
+            config: Provider configuration
+
+        Returns:
+            Function building the payload from the notification data
+        """
+        if provider == _SLACK:
+            return self._compile_slack_payload(event_type, config)
+        if provider == _DISCORD:
+            return self._compile_discord_payload(event_type, config)
+        if provider == _TEAMS:
+            return self._compile_teams_payload(event_type, config)
+        return self._compile_generic_payload(event_type, config)
+
     def _format_slack_payload(
         self, event_type: str, data: Dict[str, Any], config: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -220,7 +495,21 @@ class WebhookService:
         Returns:
             Payload formatted for Slack
         """
+        return self._compile_slack_payload(event_type, config)(data)
+
+    def _compile_slack_payload(
+        self, event_type: str, config: Dict[str, Any]
+    ) -> PayloadRenderer:
+        """
+        Resolve the Slack template once and return its payload renderer.
+
+        Args:
+            event_type: Event type
+            config: Slack configuration
 
+        Returns:
+            Function building the Slack payload from the notification data
+        """
         templates = config.get("templates", {})
         template = templates.get(event_type, templates.get("default", {}))
 
@@ -228,43 +517,55 @@ class WebhookService:
             template = {
                 "title": event_type.replace("_", " ").title(),
                 "text": f"Event {event_type}",
-                "color": "#36a64f",
+                "color": _DEFAULT_SLACK_COLOR,
             }
 
-        title = self._format_string(template.get("title", ""), data)
-        text = self._format_string(template.get("text", ""), data)
-        color = template.get("color", "#36a64f")
-
-        attachment = {
-            "color": color,
-            "title": title,
-            "text": text,
-            "fields": [],
-            "footer": f"GitHub Runner Manager • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "mrkdwn_in": ["text", "fields"],
-        }
-
-        fields = template.get("fields", [])
-        for field in fields:
-            field_name = self._format_string(field.get("name", ""), data)
-            field_value = self._format_string(field.get("value", ""), data)
-            field_short = field.get("short", True)
-
-            attachment["fields"].append(
-                {"title": field_name, "value": field_value, "short": field_short}
-            )
+        title = template.get("title", "")
+        text = template.get("text", "")
+        color = template.get("color", _DEFAULT_SLACK_COLOR)
+        use_attachment = template.get("use_attachment", True)
+        fields = [
+            (field.get("name", ""), field.get("value", ""), field.get("short", True))
+            for field in template.get("fields", [])
+        ]
+        username = config.get("username", _DEFAULT_USERNAME)
+        channel = config.get("channel")
+        fmt = self._format_string
+
+        def render(data: Dict[str, Any]) -> Dict[str, Any]:
+            formatted_text = fmt(text, data)
+            attachments = []
+            if use_attachment:
+                attachments.append(
+                    {
+                        "color": color,
+                        "title": fmt(title, data),
+                        "text": formatted_text,
+                        "fields": [
+                            {
+                                "title": fmt(name, data),
+                                "value": fmt(value, data),
+                                "short": short,
+                            }
+                            for name, value, short in fields
+                        ],
+                        "footer": f"GitHub Runner Manager • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                        "mrkdwn_in": ["text", "fields"],
+                    }
+                )
 
-        payload = {
-            "username": config.get("username", "GitHub Runner Manager"),
-            "text": text if not template.get("use_attachment", True) else "",
-            "attachments": [attachment] if template.get("use_attachment", True) else [],
-        }
+            payload = {
+                "username": username,
+                "text": "" if use_attachment else formatted_text,
+                "attachments": attachments,
+            }
 
-        channel = config.get("channel")
-        if channel:
-            payload["channel"] = channel
+            if channel:
+                payload["channel"] = channel
 
-        return payload
+            return payload
+
+        return render
 
     def _format_discord_payload(
         self, event_type: str, data: Dict[str, Any], config: Dict[str, Any]
@@ -280,6 +581,21 @@ class WebhookService:
         Returns:
             Payload formatted for Discord
         """
+        return self._compile_discord_payload(event_type, config)(data)
+
+    def _compile_discord_payload(
+        self, event_type: str, config: Dict[str, Any]
+    ) -> PayloadRenderer:
+        """
+        Resolve the Discord template once and return its payload renderer.
+
+        Args:
+            event_type: Event type
+            config: Discord configuration
+
+        Returns:
+            Function building the Discord payload from the notification data
+        """
         templates = config.get("templates", {})
         template = templates.get(event_type, templates.get("default", {}))
 
@@ -287,38 +603,43 @@ class WebhookService:
             template = {
                 "title": event_type.replace("_", " ").title(),
                 "description": f"Event {event_type}",
-                "color": 3066993,
+                "color": _DEFAULT_DISCORD_COLOR,
             }
 
-        title = self._format_string(template.get("title", ""), data)
-        description = self._format_string(template.get("description", ""), data)
-        color = template.get("color", 3066993)
-
-        embed = {
-            "title": title,
-            "description": description,
-            "color": color,
-            "fields": [],
-            "timestamp": datetime.now().isoformat(),
-        }
-
-        fields = template.get("fields", [])
-        for field in fields:
-            field_name = self._format_string(field.get("name", ""), data)
-            field_value = self._format_string(field.get("value", ""), data)
-            field_inline = field.get("inline", True)
-
-            embed["fields"].append(
-                {"name": field_name, "value": field_value, "inline": field_inline}
-            )
+        title = template.get("title", "")
+        description = template.get("description", "")
+        color = template.get("color", _DEFAULT_DISCORD_COLOR)
+        fields = [
+            (field.get("name", ""), field.get("value", ""), field.get("inline", True))
+            for field in template.get("fields", [])
+        ]
+        username = config.get("username", _DEFAULT_USERNAME)
+        avatar_url = config.get("avatar_url", "")
+        fmt = self._format_string
+
+        def render(data: Dict[str, Any]) -> Dict[str, Any]:
+            embed = {
+                "title": fmt(title, data),
+                "description": fmt(description, data),
+                "color": color,
+                "fields": [
+                    {
+                        "name": fmt(name, data),
+                        "value": fmt(value, data),
+                        "inline": inline,
+                    }
+                    for name, value, inline in fields
+                ],
+                "timestamp": datetime.now().isoformat(),
+            }
 
-        payload = {
-            "username": config.get("username", "GitHub Runner Manager"),
-            "avatar_url": config.get("avatar_url", ""),
-            "embeds": [embed],
-        }
+            return {
+                "username": username,
+                "avatar_url": avatar_url,
+                "embeds": [embed],
+            }
 
-        return payload
+        return render
 
     def _format_teams_payload(
         self, event_type: str, data: Dict[str, Any], config: Dict[str, Any]
@@ -334,56 +655,76 @@ class WebhookService:
         Returns:
             Payload formatted for Teams
         """
+        return self._compile_teams_payload(event_type, config)(data)
+
+    def _compile_teams_payload(
+        self, event_type: str, config: Dict[str, Any]
+    ) -> PayloadRenderer:
+        """
+        Resolve the Teams template once and return its payload renderer.
+
+        Args:
+            event_type: Event type
+            config: Teams configuration
+
+        Returns:
+            Function building the Teams payload from the notification data
+        """
         templates = config.get("templates", {})
         template = templates.get(event_type, templates.get("default", {}))
 
         if not template:
             template = {
                 "title": event_type.replace("_", " ").title(),
-                "themeColor": "0076D7",
+                "themeColor": _DEFAULT_TEAMS_COLOR,
                 "sections": [{"activityTitle": f"Event {event_type}", "facts": []}],
             }
 
-        title = self._format_string(template.get("title", ""), data)
-        theme_color = template.get("themeColor", "0076D7")
-
-        sections = []
-        template_sections = template.get("sections", [])
-
-        for section_template in template_sections:
-            section = {}
-
-            if "activityTitle" in section_template:
-                section["activityTitle"] = self._format_string(
-                    section_template["activityTitle"], data
-                )
-
-            if "facts" in section_template:
-                facts = []
-                for fact_template in section_template["facts"]:
-                    fact = {
-                        "name": self._format_string(
-                            fact_template.get("name", ""), data
-                        ),
-                        "value": self._format_string(
-                            fact_template.get("value", ""), data
-                        ),
-                    }
-                    facts.append(fact)
-                section["facts"] = facts
-
-            sections.append(section)
-
-        payload = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "summary": title,
-            "themeColor": theme_color,
-            "title": title,
-            "sections": sections,
-        }
+        title = template.get("title", "")
+        theme_color = template.get("themeColor", _DEFAULT_TEAMS_COLOR)
+
+        # (activityTitle or None, [(name, value), ...] or None) per section
+        sections = [
+            (
+                section_template.get("activityTitle"),
+                (
+                    [
+                        (fact.get("name", ""), fact.get("value", ""))
+                        for fact in section_template["facts"]
+                    ]
+                    if "facts" in section_template
+                    else None
+                ),
+            )
+            for section_template in template.get("sections", [])
+        ]
+        fmt = self._format_string
+
+        def render(data: Dict[str, Any]) -> Dict[str, Any]:
+            formatted_title = fmt(title, data)
+            formatted_sections = []
+
+            for activity_title, facts in sections:
+                section = {}
+                if activity_title is not None:
+                    section["activityTitle"] = fmt(activity_title, data)
+                if facts is not None:
+                    section["facts"] = [
+                        {"name": fmt(name, data), "value": fmt(value, data)}
+                        for name, value in facts
+                    ]
+                formatted_sections.append(section)
+
+            return {
+                "@type": "MessageCard",
+                "@context": "http://schema.org/extensions",
+                "summary": formatted_title,
+                "themeColor": theme_color,
+                "title": formatted_title,
+                "sections": formatted_sections,
+            }
 
-        return payload
+        return render
 
     def _format_generic_payload(
         self, event_type: str, data: Dict[str, Any], config: Dict[str, Any]
@@ -399,13 +740,30 @@ class WebhookService:
         Returns:
             Payload formatted for the generic webhook
         """
-        payload = {
-            "event_type": event_type,
-            "timestamp": datetime.now().isoformat(),
-            "data": data,
-        }
+        return self._compile_generic_payload(event_type, config)(data)
+
+    def _compile_generic_payload(
+        self, event_type: str, config: Dict[str, Any]
+    ) -> PayloadRenderer:
+        """
+        Return the payload renderer of a generic webhook.
+
+        Args:
+            event_type: Event type
+            config: Webhook configuration
+
+        Returns:
+            Function building the generic payload from the notification data
+        """
+
+        def render(data: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "event_type": event_type,
+                "timestamp": datetime.now().isoformat(),
+                "data": data,
+            }
 
-        return payload
+        return render
 
     def _format_string(self, template_str: str, data: Dict[str, Any]) -> str:
         """
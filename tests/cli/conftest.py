@@ -0,0 +1,50 @@
+"""
+Configuration for tests in the cli folder.
+
+This module provides the CLI application and the DockerService mocks shared
+by the CLI command tests.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.services.docker_service import DockerService
+
+# Fixture attribute -> DockerService method driven by the CLI commands
+DOCKER_MOCKED_METHODS = {
+    "build": "build_runner_images",
+    "start": "start_runners",
+    "stop": "stop_runners",
+    "remove": "remove_runners",
+    "check": "check_base_image_update",
+    "list": "list_runners",
+}
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Typer application of the CLI, imported on first use rather than at collection."""
+    from src.presentation.cli.commands import app
+
+    return app
+
+
+@pytest.fixture(autouse=True)
+def docker_mocks(monkeypatch):
+    """Replace the DockerService methods used by the CLI with mocks.
+
+    Tests configure ``docker_mocks.<name>.return_value`` or ``side_effect``
+    instead of stacking ``@patch`` decorators; monkeypatch restores the
+    real methods after each test.
+    """
+    mocks = SimpleNamespace(
+        **{
+            name: Mock(spec=getattr(DockerService, method))
+            for name, method in DOCKER_MOCKED_METHODS.items()
+        }
+    )
+    for name, method in DOCKER_MOCKED_METHODS.items():
+        monkeypatch.setattr(DockerService, method, getattr(mocks, name))
+    return mocks
@@ -1,240 +1,200 @@
 """Consolidated tests for build/start/stop/remove commands."""
 
-from unittest.mock import patch
+from types import MappingProxyType
 
 import pytest
 
-from src.presentation.cli.commands import app
-
-
-@pytest.mark.parametrize(
-    "result_data,expected",
-    [
-        (
-            {
-                "built": [{"image": "img", "dockerfile": "Df", "id": "x"}],
-                "skipped": [],
-                "errors": [],
-            },
-            ["SUCCESS", "img", "Df"],
-        ),
-        (
-            {
-                "built": [],
-                "skipped": [{"id": "x", "reason": "No build_image"}],
-                "errors": [],
-            },
-            ["INFO", "No image", "No build_image"],
-        ),
-        (
-            {
-                "built": [],
-                "skipped": [],
-                "errors": [{"id": "x", "reason": "Build failed"}],
-            },
-            ["ERROR", "x", "Build failed"],
-        ),
-        (
-            {"built": [], "skipped": [], "errors": []},
-            [],
-        ),
-    ],
+# Empty service results shared by every case; each case overrides one key
+EMPTY_BUILD = MappingProxyType({"built": [], "skipped": [], "errors": []})
+EMPTY_START = MappingProxyType(
+    {"started": [], "restarted": [], "running": [], "removed": [], "errors": []}
 )
-@patch("src.services.docker_service.DockerService.build_runner_images")
-def test_build_runners_images(mock_build, cli, result_data, expected):
-    mock_build.return_value = result_data
-    res = cli.invoke(app, ["build-runners-images"])
-    assert res.exit_code == 0
-    for text in expected:
-        assert text in res.stdout
+EMPTY_STOP = MappingProxyType({"stopped": [], "skipped": [], "errors": []})
+EMPTY_REMOVE = MappingProxyType({"removed": [], "skipped": [], "errors": []})
+EMPTY_LIST = ()
 
-
-@pytest.mark.parametrize(
-    "result_data,expected",
-    [
-        (
-            {
-                "started": [{"name": "r1"}],
-                "restarted": [],
-                "running": [],
-                "removed": [],
-                "errors": [],
-            },
-            ["r1", "started"],
-        ),
-        (
-            {
-                "started": [],
-                "restarted": [{"name": "r2"}],
-                "running": [],
-                "removed": [],
-                "errors": [],
-            },
-            ["r2", "Restarting"],
-        ),
-        (
-            {
-                "started": [],
-                "restarted": [],
-                "running": [{"name": "r3"}],
-                "removed": [],
-                "errors": [],
-            },
-            ["r3", "already running"],
-        ),
-        (
-            {
-                "started": [],
-                "restarted": [],
-                "running": [],
-                "removed": [{"name": "old"}],
-                "errors": [],
-            },
-            ["old", "no longer required"],
-        ),
-        (
-            {
-                "started": [],
-                "restarted": [],
-                "running": [],
-                "removed": [],
-                "errors": [{"id": "e", "reason": "fail"}],
-            },
-            ["ERROR", "e", "fail"],
-        ),
-        (
-            {
-                "started": [],
-                "restarted": [],
-                "running": [],
-                "removed": [],
-                "errors": [],
-            },
-            [],
-        ),
-    ],
-)
-@patch("src.services.docker_service.DockerService.start_runners")
-def test_start_runners(mock_start, cli, result_data, expected):
-    mock_start.return_value = result_data
-    res = cli.invoke(app, ["start-runners"])
-    assert res.exit_code == 0
-    for text in expected:
-        assert text in res.stdout
+_BUILD_ARGV = ("build-runners-images",)
+_START_ARGV = ("start-runners",)
+_STOP_ARGV = ("stop-runners",)
+_REMOVE_ARGV = ("remove-runners",)
 
 
-@pytest.mark.parametrize(
-    "result_data,expected",
-    [
-        (
-            {"stopped": [{"name": "r1"}], "skipped": [], "errors": []},
-            ["r1", "stopped"],
-        ),
-        (
-            {"stopped": [], "skipped": [{"name": "r2"}], "errors": []},
-            ["r2", "is not running"],
-        ),
-        (
-            {"stopped": [], "skipped": [], "errors": [{"name": "e", "reason": "fail"}]},
-            ["ERROR", "e", "fail"],
-        ),
-        (
-            {"stopped": [], "skipped": [], "errors": []},
-            [],
-        ),
-    ],
-)
-@patch("src.services.docker_service.DockerService.stop_runners")
-def test_stop_runners(mock_stop, cli, result_data, expected):
-    mock_stop.return_value = result_data
-    res = cli.invoke(app, ["stop-runners"])
-    assert res.exit_code == 0
-    for text in expected:
-        assert text in res.stdout
+CASES = [
+    pytest.param(
+        _BUILD_ARGV,
+        "build",
+        {**EMPTY_BUILD, "built": [{"image": "img", "dockerfile": "Df", "id": "x"}]},
+        ["SUCCESS", "img", "Df"],
+        EMPTY_LIST,
+        id="build-success",
+    ),
+    pytest.param(
+        _BUILD_ARGV,
+        "build",
+        {**EMPTY_BUILD, "skipped": [{"id": "x", "reason": "No build_image"}]},
+        ["INFO", "No image", "No build_image"],
+        EMPTY_LIST,
+        id="build-skipped",
+    ),
+    pytest.param(
+        _BUILD_ARGV,
+        "build",
+        {**EMPTY_BUILD, "errors": [{"id": "x", "reason": "Build failed"}]},
+        ["ERROR", "x", "Build failed"],
+        EMPTY_LIST,
+        id="build-error",
+    ),
+    pytest.param(
+        _BUILD_ARGV,
+        "build",
+        dict(EMPTY_BUILD),
+        EMPTY_LIST,
+        EMPTY_LIST,
+        id="build-empty",
+    ),
+    pytest.param(
+        _START_ARGV,
+        "start",
+        {**EMPTY_START, "started": [{"name": "r1"}]},
+        ["r1", "started"],
+        EMPTY_LIST,
+        id="start-started",
+    ),
+    pytest.param(
+        _START_ARGV,
+        "start",
+        {**EMPTY_START, "restarted": [{"name": "r2"}]},
+        ["r2", "Restarting"],
+        EMPTY_LIST,
+        id="start-restarted",
+    ),
+    pytest.param(
+        _START_ARGV,
+        "start",
+        {**EMPTY_START, "running": [{"name": "r3"}]},
+        ["r3", "already running"],
+        EMPTY_LIST,
+        id="start-running",
+    ),
+    pytest.param(
+        _START_ARGV,
+        "start",
+        {**EMPTY_START, "removed": [{"name": "old"}]},
+        ["old", "no longer required"],
+        EMPTY_LIST,
+        id="start-removed",
+    ),
+    pytest.param(
+        _START_ARGV,
+        "start",
+        {**EMPTY_START, "errors": [{"id": "e", "reason": "fail"}]},
+        ["ERROR", "e", "fail"],
+        EMPTY_LIST,
+        id="start-error",
+    ),
+    pytest.param(
+        _START_ARGV,
+        "start",
+        dict(EMPTY_START),
+        EMPTY_LIST,
+        EMPTY_LIST,
+        id="start-empty",
+    ),
+    pytest.param(
+        _STOP_ARGV,
+        "stop",
+        {**EMPTY_STOP, "stopped": [{"name": "r1"}]},
+        ["r1", "stopped"],
+        EMPTY_LIST,
+        id="stop-stopped",
+    ),
+    pytest.param(
+        _STOP_ARGV,
+        "stop",
+        {**EMPTY_STOP, "skipped": [{"name": "r2"}]},
+        ["r2", "is not running"],
+        EMPTY_LIST,
+        id="stop-skipped",
+    ),
+    pytest.param(
+        _STOP_ARGV,
+        "stop",
+        {**EMPTY_STOP, "errors": [{"name": "e", "reason": "fail"}]},
+        ["ERROR", "e", "fail"],
+        EMPTY_LIST,
+        id="stop-error",
+    ),
+    pytest.param(
+        _STOP_ARGV,
+        "stop",
+        dict(EMPTY_STOP),
+        EMPTY_LIST,
+        EMPTY_LIST,
+        id="stop-empty",
+    ),
+    pytest.param(
+        _REMOVE_ARGV,
+        "remove",
+        {**EMPTY_REMOVE, "removed": [{"container": "c1"}]},
+        ["c1", "removed successfully"],
+        EMPTY_LIST,
+        id="remove-container",
+    ),
+    pytest.param(
+        _REMOVE_ARGV,
+        "remove",
+        {**EMPTY_REMOVE, "removed": [{"name": "r"}]},
+        EMPTY_LIST,
+        ["removed successfully"],  # message container non attendu
+        id="remove-without-container",
+    ),
+    pytest.param(
+        _REMOVE_ARGV,
+        "remove",
+        {**EMPTY_REMOVE, "skipped": [{"name": "s", "reason": "déjà supprimé"}]},
+        ["déjà supprimé"],
+        EMPTY_LIST,
+        id="remove-skipped",
+    ),
+    pytest.param(
+        _REMOVE_ARGV,
+        "remove",
+        {**EMPTY_REMOVE, "errors": [{"name": "e", "reason": "fail"}]},
+        ["ERROR", "e", "fail"],
+        EMPTY_LIST,
+        id="remove-error",
+    ),
+    pytest.param(
+        _REMOVE_ARGV,
+        "remove",
+        dict(EMPTY_REMOVE),
+        EMPTY_LIST,
+        EMPTY_LIST,
+        id="remove-empty",
+    ),
+]
 
 
-@pytest.mark.parametrize(
-    "result_data,expected_present,expected_absent",
-    [
-        (
-            {"removed": [{"container": "c1"}], "skipped": [], "errors": []},
-            ["c1", "removed successfully"],
-            [],
-        ),
-        (
-            {"removed": [{"name": "r"}], "skipped": [], "errors": []},
-            [],
-            ["removed successfully"],  # message container non attendu
-        ),
-        (
-            {
-                "removed": [],
-                "skipped": [{"name": "s", "reason": "déjà supprimé"}],
-                "errors": [],
-            },
-            ["déjà supprimé"],
-            [],
-        ),
-        (
-            {"removed": [], "skipped": [], "errors": [{"name": "e", "reason": "fail"}]},
-            ["ERROR", "e", "fail"],
-            [],
-        ),
-        (
-            {"removed": [], "skipped": [], "errors": []},
-            [],
-            [],
-        ),
-    ],
-)
-@patch("src.services.docker_service.DockerService.remove_runners")
-def test_remove_runners(
-    mock_remove, cli, result_data, expected_present, expected_absent
-):
-    mock_remove.return_value = result_data
-    res = cli.invoke(app, ["remove-runners"])
+@pytest.mark.parametrize("argv,method,data,present,absent", CASES)
+def test_runner_command(docker_mocks, cli, app, argv, method, data, present, absent):
+    getattr(docker_mocks, method).return_value = data
+    res = cli.invoke(app, argv)
     assert res.exit_code == 0
-    for text in expected_present:
-        assert text in res.stdout
-    for text in expected_absent:
-        assert text not in res.stdout
+    stdout = res.stdout
+    for f in present:
+        assert f in stdout
+    for f in absent:
+        assert f not in stdout
 
 
-@patch("src.presentation.cli.commands.docker_service.build_runner_images")
-@patch("src.presentation.cli.commands.docker_service.check_base_image_update")
-@patch("src.presentation.cli.commands.typer.confirm")
-def test_check_base_image_update_build_outputs(
-    mock_confirm, mock_check_update, mock_build, cli
-):
-    """Covers lines printing skipped and error cases after
-    building images inside check_base_image_update interactive flow."""
-    # Two confirmations: update then build
-    mock_confirm.side_effect = [True, True]
-    # First call: update available
-    first_result = {
-        "current_version": "2.300.0",
-        "latest_version": "2.301.0",
-        "update_available": True,
-        "error": None,
-    }
-    # Second call: after auto_update
-    second_result = {
-        **first_result,
-        "updated": True,
-        "new_image": "ghcr.io/actions/runner:2.301.0",
-    }
-    mock_check_update.side_effect = [first_result, second_result]
-    mock_build.return_value = {
-        "built": [],
-        "skipped": [{"id": "r1", "reason": "No build_image specified"}],
-        "errors": [{"id": "r2", "reason": "Build failed"}],
-    }
+def test_command_flushes_notifications_on_exit(docker_mocks, cli, app, monkeypatch):
+    """Les notifications en arrière-plan sont livrées avant la fin de la commande."""
+    from src.presentation.cli import commands
 
-    res = cli.invoke(app, ["check-base-image-update"])
-    assert res.exit_code == 0
-    print(res.stdout)
-    assert "No image to build" in res.stdout
-    assert "r1" in res.stdout
-    assert "ERROR" in res.stdout
-    assert "r2" in res.stdout
-    assert "Build failed" in res.stdout
+    flushed = []
+    monkeypatch.setattr(
+        commands.notification_service, "flush", lambda: flushed.append(True)
+    )
+    docker_mocks.stop.return_value = dict(EMPTY_STOP)
+    assert cli.invoke(app, _STOP_ARGV).exit_code == 0
+    assert flushed == [True]
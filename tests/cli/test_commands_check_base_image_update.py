@@ -1,205 +1,275 @@
 """Consolidated tests for check-base-image-update command."""
 
-import re
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.presentation.cli.commands import app
-
-ANSI_ESCAPE_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-
-
-def strip_ansi_codes(text: str) -> str:
-    """Supprime tous les codes d'échappement ANSI (utilisés pour la couleur) d'une chaîne."""
-    return ANSI_ESCAPE_RE.sub("", text)
-
-
-@pytest.mark.parametrize(
-    "first_result,confirm,result2,expects",
-    [
-        ({"error": "API fail"}, False, None, ["API fail"]),
-        (
-            {"current_version": "1", "latest_version": "1", "update_available": False},
-            False,
-            None,
-            ["The runner image is up to date"],
-        ),
-        (
-            {"current_version": "1", "latest_version": "2", "update_available": True},
-            False,
-            None,
-            ["New version available", "Update canceled"],
-        ),
-        (
-            {"current_version": "1", "latest_version": "2", "update_available": True},
-            True,
-            {"updated": True, "new_image": "img:2"},
-            ["updated to", "img:2"],
-        ),
-        (
-            {"current_version": "1", "latest_version": "2", "update_available": True},
-            True,
-            {"error": "write failed"},
-            ["Error updating", "write failed"],
-        ),
-        (
-            {"current_version": "1", "latest_version": "2", "update_available": True},
-            True,
-            {"updated": False},
-            [],
-        ),
-    ],
+from src.notifications.channels.webhook import WebhookChannel
+from src.presentation.cli import commands
+
+_CHECK_ARGV = ("check-base-image-update",)
+CONFIRM = "typer.confirm"
+WEBHOOK_SEND = "src.services.webhook_service.WebhookService._send_with_retry"
+
+_CHECK_UPDATE_AVAILABLE = {
+    "current_version": "1",
+    "latest_version": "2",
+    "update_available": True,
+}
+_CHECK_UP_TO_DATE = {
+    "current_version": "1",
+    "latest_version": "1",
+    "update_available": False,
+}
+_CHECK_UPDATED = {"updated": True, "new_image": "img:2"}
+_BUILD_OK = {
+    "built": [{"id": "grp", "image": "custom:latest", "dockerfile": "Dockerfile"}],
+    "skipped": [],
+    "errors": [],
+}
+DEPLOY_SNIPPETS = (
+    "started successfully",
+    "existed but stopped",
+    "already started",
+    "no longer required",
 )
-@patch("src.services.docker_service.DockerService.check_base_image_update")
-@patch("typer.confirm")
-def test_check_base_image_update(
-    mock_confirm, mock_check, cli, first_result, confirm, result2, expects
-):
-    if result2 is None:
-        mock_check.return_value = first_result
-    else:
-        mock_check.side_effect = [first_result, result2]
-    if first_result.get("update_available") and confirm:
-        mock_confirm.side_effect = [True, True, True]
-    elif first_result.get("update_available") and not confirm:
-        mock_confirm.side_effect = [False]
-    else:
-        mock_confirm.return_value = confirm
-
-    res = cli.invoke(app, ["check-base-image-update"])
-    assert res.exit_code == 0
-
-    clean_stdout = strip_ansi_codes(res.stdout)
-
-    for e in expects:
-        assert e in clean_stdout, f"Expected '{e}' to be in '{clean_stdout}'"
-
-    if first_result.get("update_available"):
-        assert mock_confirm.call_count >= 1
-    else:
-        mock_confirm.assert_not_called()
 
 
-@patch("src.services.docker_service.DockerService.build_runner_images")
-@patch("src.services.docker_service.DockerService.check_base_image_update")
-@patch("typer.confirm")
-def test_check_base_image_update_decline_build(
-    mock_confirm, mock_check, mock_build, cli
+def _run_check(
+    capsys, mocks, check_results, confirms, build_result=None, start_result=None
 ):
-    """Test branch where user declines to build images after update (branch 144->exit)."""
-    mock_check.side_effect = [
-        {"current_version": "1", "latest_version": "2", "update_available": True},
-        {"updated": True, "new_image": "img:2"},
-    ]
-    mock_confirm.side_effect = [True, False]
+    """Call the check-base-image-update command answering exactly the given prompts.
+
+    The command function is called directly; CLI wiring is covered by
+    test_check_base_image_update_webhook_called through the CliRunner.
+
+    Args:
+        capsys: Pytest capture fixture.
+        mocks: The docker_mocks fixture.
+        check_results: Successive check_base_image_update results.
+        confirms: One answer per expected prompt (update, build, deploy).
+        build_result: build_runner_images result, empty by default.
+        start_result: start_runners result, empty by default.
+
+    Returns:
+        The command stdout.
+    """
+    mocks.check.side_effect = check_results
+    mocks.build.return_value = build_result or {}
+    mocks.start.return_value = start_result or {}
+    with patch(CONFIRM, side_effect=confirms) as mock_confirm:
+        commands.check_base_image_update()
+    assert mock_confirm.call_count == len(confirms)
+    return capsys.readouterr().out
+
+
+# Parcours sans déploiement : exécutés en boucle dans un seul test
+FLOWS = [
+    pytest.param(
+        [{"error": "API fail"}], [], None, None, ["API fail"], [], id="api-error"
+    ),
+    pytest.param(
+        [_CHECK_UP_TO_DATE],
+        [],
+        None,
+        None,
+        ["The runner image is up to date"],
+        [],
+        id="up-to-date",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE],
+        [False],
+        None,
+        None,
+        ["New version available", "Update canceled"],
+        [],
+        id="cancel",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, True],
+        None,
+        None,
+        ["updated to", "img:2"],
+        [],
+        id="update-only",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, {"error": "write failed"}],
+        [True],
+        None,
+        None,
+        ["Error updating", "write failed"],
+        [],
+        id="update-error",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, {"updated": False}],
+        [True],
+        None,
+        None,
+        [],
+        [],
+        id="not-updated",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, False],
+        None,
+        None,
+        ["updated to", "img:2"],
+        ["built from"],
+        id="decline-build",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, True],
+        {
+            "built": [],
+            "skipped": [{"id": "r1", "reason": "No build_image specified"}],
+            "errors": [{"id": "r2", "reason": "Build failed"}],
+        },
+        None,
+        ["No image to build", "r1", "ERROR", "r2", "Build failed"],
+        [],
+        id="build-outputs",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, True, True],
+        {**_BUILD_OK, "errors": [{"id": "grp", "reason": "fail reason"}]},
+        None,
+        ["grp: fail reason"],
+        [],
+        id="build-error",
+    ),
+]
+
+# Branches de déploiement : gardées en parametrize pour un diagnostic par cas
+DEPLOYS = [
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, True, True],
+        _BUILD_OK,
+        {"started": [{"name": "runner-a"}]},
+        ["runner-a started successfully"],
+        [],
+        id="deploy-started",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, True, True],
+        _BUILD_OK,
+        {"restarted": [{"name": "runner-b"}]},
+        ["runner-b existed but stopped"],
+        [],
+        id="deploy-restarted",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, True, True],
+        _BUILD_OK,
+        {"running": [{"name": "runner-c"}]},
+        ["runner-c already started"],
+        [],
+        id="deploy-running",
+    ),
+    pytest.param(
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, True, True],
+        _BUILD_OK,
+        {"removed": [{"name": "runner-d"}]},
+        ["runner-d is no longer required"],
+        [],
+        id="deploy-removed",
+    ),
+]
+
+
+def _check_scenario(
+    capsys,
+    mocks,
+    check_results,
+    confirms,
+    build_result,
+    start_result,
+    present,
+    absent,
+    label="",
+):
+    out = _run_check(capsys, mocks, check_results, confirms, build_result, start_result)
+    for snippet in present:
+        assert snippet in out, f"[{label}] Missing '{snippet}' in '{out}'"
+    for snippet in absent:
+        assert snippet not in out, f"[{label}] Unexpected '{snippet}' in '{out}'"
+    # Le build n'est lancé que si la seconde confirmation est acceptée
+    assert mocks.build.called == (confirms[1:2] == [True]), label
 
-    res = cli.invoke(app, ["check-base-image-update"])
-    assert res.exit_code == 0
-    clean_stdout = strip_ansi_codes(res.stdout)
-    assert "updated to" in clean_stdout
-    assert "img:2" in clean_stdout
-    mock_build.assert_not_called()
-    assert "built from" not in clean_stdout
+
+def test_check_base_image_update_flows(docker_mocks, capsys):
+    for case in FLOWS:
+        for mock in vars(docker_mocks).values():
+            mock.reset_mock()
+        _check_scenario(capsys, docker_mocks, *case.values, label=case.id)
 
 
-@patch("src.services.docker_service.DockerService.start_runners")
-@patch("src.services.docker_service.DockerService.build_runner_images")
-@patch("src.services.docker_service.DockerService.check_base_image_update")
-@patch("typer.confirm")
 @pytest.mark.parametrize(
-    "start_result, expected_snippets, deploy_confirm",
-    [
-        ({}, [], False),
-        ({"started": [{"name": "runner-a"}]}, ["runner-a started successfully"], True),
-        (
-            {"restarted": [{"name": "runner-b"}]},
-            ["runner-b existed but stopped"],
-            True,
-        ),
-        ({"running": [{"name": "runner-c"}]}, ["runner-c already started"], True),
-        ({"removed": [{"name": "runner-d"}]}, ["runner-d is no longer required"], True),
-    ],
+    "check_results,confirms,build_result,start_result,present,absent", DEPLOYS
 )
-def test_check_base_image_update_deploy_branches(
-    mock_confirm,
-    mock_check,
-    mock_build,
-    mock_start,
-    cli,
+def test_check_base_image_update_deploy(
+    docker_mocks,
+    capsys,
+    check_results,
+    confirms,
+    build_result,
     start_result,
-    expected_snippets,
-    deploy_confirm,
+    present,
+    absent,
 ):
-    # 1ère invocation: update disponible; 2ème: mise à jour appliquée
-    mock_check.side_effect = [
-        {"current_version": "1", "latest_version": "2", "update_available": True},
-        {"updated": True, "new_image": "img:2"},
-    ]
-    # Build retourne une image pour activer la branche de déploiement potentielle
-    mock_build.return_value = {
-        "built": [{"id": "grp", "image": "custom:latest", "dockerfile": "Dockerfile"}],
-        "skipped": [],
-        "errors": [],
-    }
-    mock_start.return_value = {
-        "started": [],
-        "restarted": [],
-        "running": [],
-        "removed": [],
-        "errors": [],
-        **start_result,
-    }
-
-    # Séquence des confirmations:
-    # 1) update yes
-    # 2) build yes
-    # 3) deploy yes/no selon le paramètre
-    mock_confirm.side_effect = [True, True, deploy_confirm]
-
-    res = cli.invoke(app, ["check-base-image-update"])
-    assert res.exit_code == 0
-    clean_stdout = strip_ansi_codes(res.stdout)
-
-    # Si l'utilisateur refuse le déploiement, rien de spécifique ne doit apparaître
-    if not deploy_confirm:
-        for snippet in [
-            "démarré avec succès",
-            "existant mais stoppé",
-            "déjà démarré",
-            "n'est plus requis",
-        ]:
-            assert snippet not in clean_stdout
-        return
-
-    for snippet in expected_snippets:
-        assert (
-            snippet in clean_stdout
-        ), f"Snippet attendu manquant: {snippet}\nSortie: {clean_stdout}"
-
-
-@patch("src.services.webhook_service.WebhookService._send_with_retry")
-@patch("src.services.docker_service.DockerService.check_base_image_update")
-@patch("typer.confirm")
+    _check_scenario(
+        capsys,
+        docker_mocks,
+        check_results,
+        confirms,
+        build_result,
+        start_result,
+        present,
+        absent,
+    )
+
+
+def test_check_base_image_update_declines_deploy(docker_mocks, capsys):
+    """Refus du déploiement : start_runners n'est jamais appelé."""
+    out = _run_check(
+        capsys,
+        docker_mocks,
+        [_CHECK_UPDATE_AVAILABLE, _CHECK_UPDATED],
+        [True, True, False],
+        _BUILD_OK,
+    )
+    docker_mocks.start.assert_not_called()
+    for snippet in DEPLOY_SNIPPETS:
+        assert snippet not in out
+
+
+@patch(WEBHOOK_SEND)
+@patch(CONFIRM)
 def test_check_base_image_update_webhook_called(
-    mock_confirm, mock_check, mock_webhook_send, cli
+    mock_confirm, mock_webhook_send, docker_mocks, cli, app
 ):
     """Vérifie que le webhook est bien appelé avec les bonnes infos lors d'une mise à jour."""
-    mock_check.side_effect = [
-        {
-            "current_version": "1",
-            "latest_version": "2",
-            "update_available": True,
-            "image_name": "image:1.0.1",
-        },
-        {"updated": True, "new_image": "img:2"},
+    docker_mocks.check.side_effect = [
+        {**_CHECK_UPDATE_AVAILABLE, "image_name": "image:1.0.1"},
+        _CHECK_UPDATED,
     ]
     # Accepte la mise à jour, refuse le build pour éviter des notifications de build aléatoires
     mock_confirm.side_effect = [True, False]
 
-    res = cli.invoke(app, ["check-base-image-update"])
+    res = cli.invoke(app, _CHECK_ARGV)
     assert res.exit_code == 0
 
+    # Les notifications en arrière-plan sont livrées à la fin de la commande
     assert mock_webhook_send.called, "Le webhook n'a pas été appelé."
 
     titles = []
@@ -224,10 +294,6 @@ def test_check_base_image_update_webhook_called(
 
 def test_webhook_channel_removes_restarted_false(monkeypatch):
     """Couvre la suppression de 'restarted' si False dans WebhookChannel.send."""
-    from unittest.mock import MagicMock
-
-    from src.notifications.channels.webhook import WebhookChannel
-
     # Mock WebhookService
     mock_svc = MagicMock()
     channel = WebhookChannel(mock_svc)
@@ -250,73 +316,3 @@ def test_webhook_channel_removes_restarted_false(monkeypatch):
     assert (
         "restarted" not in sent_payload
     ), f"'restarted' should be removed, got: {sent_payload}"
-
-
-@patch("src.services.docker_service.DockerService.build_runner_images")
-@patch("src.services.docker_service.DockerService.check_base_image_update")
-@patch("typer.confirm")
-def test_check_base_image_update_build_error_printed(
-    mock_confirm, mock_check, mock_build, cli
-):
-    # Simule update disponible, update acceptée, build acceptée
-    mock_check.side_effect = [
-        {"current_version": "1", "latest_version": "2", "update_available": True},
-        {"updated": True, "new_image": "img:2"},
-    ]
-    mock_confirm.side_effect = [True, True, True]  # update, build, deploy
-    mock_build.return_value = {
-        "built": [{"id": "grp", "image": "custom:latest", "dockerfile": "Dockerfile"}],
-        "skipped": [],
-        "errors": [{"id": "grp", "reason": "fail reason"}],
-    }
-
-    res = cli.invoke(app, ["check-base-image-update"])
-    print(res.stdout)
-    assert res.exit_code == 0
-    assert "grp: fail reason" in res.stdout
-
-
-def test_build_runner_images_image_size_exception(monkeypatch):
-    """Couvre le except Exception: image_size = 0 dans build_runner_images."""
-    from types import SimpleNamespace
-
-    from src.services import DockerService
-
-    class DummyConfig:
-        runners = [
-            SimpleNamespace(
-                build_image="Dockerfile",
-                techno="x",
-                techno_version="1",
-                name_prefix="foo",
-            )
-        ]
-        runners_defaults = SimpleNamespace(base_image="img:1.0.0")
-
-    class DummyConfigService:
-        def load_config(self):
-            return DummyConfig()
-
-    svc = DockerService(DummyConfigService())
-    monkeypatch.setattr(svc, "build_image", lambda **kwargs: None)
-
-    class DummyImages:
-        def get(self, tag):
-            raise Exception("fail")
-
-    class DummyClient:
-        images = DummyImages()
-
-    monkeypatch.setattr("docker.from_env", lambda: DummyClient())
-    result = svc.build_runner_images()
-    assert result["built"][0]["image_size"] == "0.00 B"
-
-
-def test_format_size_pb():
-    """Couvre le cas PB dans _format_size."""
-    from src.services import DockerService
-
-    svc = DockerService(lambda: None)
-    # 2**60 = 1 PB
-    pb = 2**60
-    assert svc._format_size(pb).endswith("PB")
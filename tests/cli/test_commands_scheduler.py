@@ -2,43 +2,49 @@
 
 from unittest import mock
 
+import pytest
+
 from src.presentation.cli.commands import console, scheduler, scheduler_service
 
 
 class TestCommands:
     """Tests for the CLI commands of GitHub Runner Manager."""
 
+    _start_mock = mock.MagicMock()
+    _stop_mock = mock.MagicMock()
+
+    @pytest.fixture(autouse=True)
+    def _patch_scheduler(self, monkeypatch):
+        """Install the shared mocks; monkeypatch restores the real methods."""
+        for m in (self._start_mock, self._stop_mock):
+            m.reset_mock(return_value=True, side_effect=True)
+        self.printed = []
+        monkeypatch.setattr(scheduler_service, "start", self._start_mock)
+        monkeypatch.setattr(scheduler_service, "stop", self._stop_mock)
+        monkeypatch.setattr(console, "print", self.printed.append)
+
     def test_scheduler_normal_execution(self):
         """Test normal execution of the scheduler command."""
-        scheduler_service.start = mock.MagicMock()
-
         scheduler()
 
-        scheduler_service.start.assert_called_once()
+        self._start_mock.assert_called_once()
 
     def test_scheduler_keyboard_interrupt(self):
         """Test the scheduler command with KeyboardInterrupt."""
-        scheduler_service.start = mock.MagicMock(side_effect=KeyboardInterrupt())
-        scheduler_service.stop = mock.MagicMock()
-        console.print = mock.MagicMock()
+        self._start_mock.side_effect = KeyboardInterrupt()
 
         scheduler()
 
-        scheduler_service.start.assert_called_once()
-        scheduler_service.stop.assert_called_once()
-        console.print.assert_called_once_with(
-            "[yellow]Scheduler stopped manually.[/yellow]"
-        )
+        self._start_mock.assert_called_once()
+        self._stop_mock.assert_called_once()
+        assert self.printed == ["[yellow]Scheduler stopped manually.[/yellow]"]
 
     def test_scheduler_exception(self):
         """Test the scheduler command with a generic exception."""
         test_exception = Exception("Test error")
-        scheduler_service.start = mock.MagicMock(side_effect=test_exception)
-        console.print = mock.MagicMock()
+        self._start_mock.side_effect = test_exception
 
         scheduler()
 
-        scheduler_service.start.assert_called_once()
-        console.print.assert_called_once_with(
-            f"[red]Error in scheduler: {str(test_exception)}[/red]"
-        )
+        self._start_mock.assert_called_once()
+        assert self.printed == [f"[red]Error in scheduler: {str(test_exception)}[/red]"]
@@ -5,36 +5,87 @@
 - Exposes a shared CliRunner for CLI tests
 """
 
-from copy import deepcopy
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, create_autospec, patch
 
 import pytest
 import yaml
-from typer.testing import CliRunner
+from click.testing import CliRunner
+from typer.main import get_command
 
 from src.services import ConfigService, DockerService
 from src.services.config_schema import FullConfig
 
+# Configuration d'exemple versionnée, utilisée à la place de la config locale
+_SAMPLE_CONFIG = Path(__file__).resolve().parent.parent / "runners_config.yaml.dist"
+
+
+def pytest_configure(config):
+    """Import the CLI commands module against the versioned sample config.
+
+    commands.py builds its services at import time from ConfigService(), i.e.
+    the local ./runners_config.yaml, which is per-user and not tracked. The
+    module is imported here, before collection, with a ConfigService reading
+    runners_config.yaml.dist instead.
+    """
+    with patch(
+        "src.services.ConfigService", lambda: ConfigService(str(_SAMPLE_CONFIG))
+    ):
+        import src.presentation.cli.commands  # noqa: F401
 
-@pytest.fixture(autouse=True)
-def block_real_webhook_requests():
-    """Prevent any outgoing HTTP requests via requests.post (webhooks) during tests."""
-    with patch("requests.post") as mock_post:
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.text = "MOCKED"
-        yield mock_post
+
+@pytest.fixture(scope="session", autouse=True)
+def _http_patches():
+    """Patch requests.post, requests.get and requests.Session once for the session."""
+    with (
+        patch("requests.post") as mock_post,
+        patch("requests.Session.request") as mock_request,
+        patch("requests.get") as mock_get,
+    ):
+        yield mock_post, mock_request, mock_get
 
 
 @pytest.fixture(autouse=True)
-def mock_webhook_service():
-    """Global patch of WebhookService to disable real notifications in all tests."""
+def block_real_webhook_requests(_http_patches):
+    """Prevent any outgoing HTTP requests via requests.post, requests.get or a
+    requests.Session (webhooks, GitHub API) during tests."""
+    for mock in _http_patches:
+        mock.reset_mock(return_value=True, side_effect=True)
+        mock.return_value = MagicMock(status_code=200, text="MOCKED", headers={})
+    return _http_patches[0]
+
+
+@pytest.fixture
+def github_http(_http_patches, block_real_webhook_requests):
+    """Session-wide requests.get/requests.post mocks, reset for this test.
+
+    Configure the GitHub API answers on them instead of patching requests:
+        github_http.get.return_value.json.return_value = {"tag_name": "v2.301.0"}
+    """
+    mock_post, _, mock_get = _http_patches
+    return SimpleNamespace(get=mock_get, post=mock_post)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _webhook_service_patch():
     with patch("src.services.notification_service.WebhookService") as mock:
         yield mock
 
 
-@pytest.fixture
-def valid_config():
-    """Fixture for a valid runners configuration."""
+@pytest.fixture(autouse=True)
+def mock_webhook_service(_webhook_service_patch):
+    """Global patch of WebhookService to disable real notifications in all tests."""
+    _webhook_service_patch.reset_mock(return_value=True, side_effect=True)
+    return _webhook_service_patch
+
+
+@pytest.fixture(scope="session")
+def _valid_config_template():
+    """Valid runners configuration, validated once per session."""
     return FullConfig.model_validate(
         {
             "runners_defaults": {
@@ -65,45 +116,112 @@ def valid_config():
     )
 
 
+@pytest.fixture(scope="session")
+def _valid_config_pickle(_valid_config_template):
+    """Pickled valid configuration: unpickling beats model_copy(deep=True)."""
+    return pickle.dumps(_valid_config_template, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@pytest.fixture
+def valid_config(_valid_config_pickle):
+    """Fixture for a valid runners configuration (private copy per test)."""
+    return pickle.loads(_valid_config_pickle)
+
+
+@pytest.fixture(scope="session")
+def _config_yaml_bytes(_valid_config_template):
+    """YAML dump of the valid configuration, rendered once per session."""
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(
+        _valid_config_template.model_dump(mode="json"), Dumper=dumper
+    ).encode()
+
+
 @pytest.fixture
-def config_file(valid_config, tmp_path):
+def config_file(_config_yaml_bytes, tmp_path):
     """Fixture for a temporary configuration file."""
     config_path = tmp_path / "test_config.yaml"
-    # valid_config est un FullConfig, on le convertit en dict pour YAML
-    with open(config_path, "w") as f:
-        yaml.dump(valid_config.model_dump(), f)
+    config_path.write_bytes(_config_yaml_bytes)
     return str(config_path)
 
 
+@pytest.fixture(scope="session")
+def _config_service_spec():
+    """ConfigService autospec, introspected once per session."""
+    return create_autospec(ConfigService, spec_set=True)
+
+
 @pytest.fixture
-def mock_config_service(valid_config):
-    """Fixture for a mocked configuration service."""
-    service = create_autospec(ConfigService, spec_set=True)
-    service.load_config.return_value = valid_config
-    return service
+def autospec_config_service(_config_service_spec, valid_config):
+    """Session-wide ConfigService autospec, reset and loaded with valid_config."""
+    _config_service_spec.reset_mock(return_value=True, side_effect=True)
+    _config_service_spec.load_config.return_value = valid_config
+    return _config_service_spec
 
 
 @pytest.fixture
-def config_service_factory(valid_config):
+def mock_config_service(autospec_config_service):
+    """Fixture for a mocked configuration service.
+
+    Shares the session ConfigService autospec; it is reset before each test,
+    so return values configured on its methods do not leak.
+    """
+    return autospec_config_service
+
+
+class _StubConfigService:
+    """Minimal ConfigService stand-in for tests that only need load_config()."""
+
+    def __init__(self, cfg):
+        self._cfg = cfg
+        self.calls = 0
+
+    def load_config(self):
+        self.calls += 1
+        return self._cfg
+
+
+@pytest.fixture
+def stub_config_service(valid_config):
+    """Plain ConfigService stub returning valid_config, without mock machinery.
+
+    Use it where load_config() is never reconfigured nor asserted through the
+    mock API; `calls` counts the load_config() calls.
+    """
+    return _StubConfigService(valid_config)
+
+
+def _deep_merge(dst, src):
+    """Merge src into dst in place, iteratively, and return dst.
+
+    Values from src are assigned by reference, src itself is never modified.
+    """
+    stack = [(dst, src)]
+    while stack:
+        d, s = stack.pop()
+        for k, v in s.items():
+            if isinstance(v, dict) and isinstance(d.get(k), dict):
+                stack.append((d[k], v))
+            else:
+                d[k] = v
+    return dst
+
+
+@pytest.fixture
+def config_service_factory(_valid_config_pickle):
     """Factory to create a mocked ConfigService with overrides.
 
+    Each call unpickles its own copy of the valid configuration.
+
     Example usage:
         service = config_service_factory({"runners": [...]})
     """
 
     def _factory(overrides: dict | None = None) -> MagicMock:
-        cfg = deepcopy(valid_config)
+        cfg = pickle.loads(_valid_config_pickle)
         if overrides:
-            # Merge naïf et récursif minimal
-            def _merge(dst, src):
-                for k, v in src.items():
-                    if isinstance(v, dict) and isinstance(dst.get(k), dict):
-                        _merge(dst[k], v)
-                    else:
-                        dst[k] = v
-                return dst
-
-            cfg = _merge(cfg, deepcopy(overrides))
+            # Les overrides ne sont pas fiables : on revalide le résultat fusionné
+            cfg = FullConfig.model_validate(_deep_merge(cfg.model_dump(), overrides))
 
         service = create_autospec(ConfigService, spec_set=True)
         service.load_config.return_value = cfg
@@ -118,29 +236,42 @@ def config_service(config_service_factory):
     return config_service_factory()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _docker_patch():
+    with patch("docker.from_env") as mock_docker:
+        yield mock_docker
+
+
 @pytest.fixture(autouse=True)
-def mock_docker_client():
+def mock_docker_client(_docker_patch):
     """Global patch of docker.from_env to prevent any real Docker access."""
-    with patch("docker.from_env") as mock_docker:
-        client = MagicMock()
-        mock_docker.return_value = client
-        yield client
+    _docker_patch.reset_mock(return_value=True, side_effect=True)
+    client = MagicMock()
+    _docker_patch.return_value = client
+    return client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _no_sleep():
+    """Neutralize time.sleep as seen from docker_service for the whole session."""
+    with pytest.MonkeyPatch.context() as mp:
+        # Neutraliser exclusivement le sleep utilisé dans docker_service
+        mp.setattr(
+            "src.services.docker_service.time.sleep",
+            lambda *_args, **_kwargs: None,
+            raising=False,
+        )
+        yield
 
 
 @pytest.fixture(autouse=True)
-def isolate_env_and_sleep(monkeypatch):
+def isolate_env_and_sleep(_no_sleep):
     """Quick isolation: no GitHub token or blocking sleep by default.
 
     - Removes GITHUB_TOKEN to force the short path in _get_registration_token.
-    - Neutralizes time.sleep in the docker_service module to avoid any waiting.
+    - Relies on the session-wide _no_sleep patch to avoid any waiting.
     """
-    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
-    # Neutraliser exclusivement le sleep utilisé dans docker_service
-    monkeypatch.setattr(
-        "src.services.docker_service.time.sleep",
-        lambda *_args, **_kwargs: None,
-        raising=False,
-    )
+    os.environ.pop("GITHUB_TOKEN", None)
 
 
 @pytest.fixture
@@ -149,44 +280,53 @@ def docker_service(config_service):
     return DockerService(config_service)
 
 
-@pytest.fixture(autouse=True)
-def enforce_autospec_on_service_mocks(request):
+def _public_methods(klass):
+    """Public callables of a service class, as (name, attribute) pairs."""
+    return tuple(
+        (name, getattr(klass, name))
+        for name in dir(klass)
+        if not name.startswith("_") and callable(getattr(klass, name, None))
+    )
+
+
+# La forme des classes ne change pas pendant la session : introspection unique
+_DOCKER_METHODS = _public_methods(DockerService)
+_CONFIG_METHODS = _public_methods(ConfigService)
+
+
+@pytest.fixture
+def enforce_autospec(request):
     """If a test uses `docker_service` or `config_service` and assigns
     plain MagicMock objects to methods, replace those mocks by autospecced
     mocks (create_autospec with spec_set=True) so invalid method calls
     are detected.
 
     This is a low-risk, backward-compatible enforcement: it only replaces
-    MagicMocks already attached to the service instance.
+    MagicMocks already attached to the service instance. It is opt-in:
+    tests/docker_service/conftest.py applies it to the DockerService tests.
     """
-    from unittest.mock import MagicMock
+    names = request.fixturenames
+    if "docker_service" not in names and "config_service" not in names:
+        yield
+        return
 
-    try:
-        docker = request.getfixturevalue("docker_service")
-    except Exception:
-        docker = None
-
-    try:
-        cfgs = request.getfixturevalue("config_service")
-    except Exception:
-        cfgs = None
+    docker = (
+        request.getfixturevalue("docker_service") if "docker_service" in names else None
+    )
+    cfgs = (
+        request.getfixturevalue("config_service") if "config_service" in names else None
+    )
 
-    def _wrap_object(obj, klass):
+    def _wrap_object(obj, methods):
         if obj is None:
             return
-        for name in dir(klass):
-            if name.startswith("_"):
-                continue
-            # only consider callables defined on the class
-            try:
-                attr = getattr(klass, name)
-            except AttributeError:
-                continue
-            if not callable(attr):
+        # Only attributes set on the instance itself: hasattr() would make a
+        # MagicMock auto-create every method it is asked about
+        inst_dict = vars(obj)
+        for name, attr in methods:
+            if name not in inst_dict:
                 continue
-            if not hasattr(obj, name):
-                continue
-            current = getattr(obj, name)
+            current = inst_dict[name]
             # replace plain MagicMock without a spec by an autospecced mock
             # If the attribute is a bare MagicMock without a spec, replace it
             if (
@@ -217,8 +357,8 @@ def enforce_autospec_on_service_mocks(request):
                 except Exception:
                     pass
 
-    _wrap_object(docker, DockerService)
-    _wrap_object(cfgs, ConfigService)
+    _wrap_object(docker, _DOCKER_METHODS)
+    _wrap_object(cfgs, _CONFIG_METHODS)
     yield
 
 
@@ -234,7 +374,21 @@ def real_docker_service(real_config_service):
     return DockerService(real_config_service)
 
 
+@lru_cache(maxsize=None)
+def _click_command(app):
+    """Build the Click command tree of a Typer app once per session."""
+    return get_command(app)
+
+
+class CachedCommandRunner(CliRunner):
+    """Typer-compatible CliRunner reusing the Click command built for each app."""
+
+    def invoke(self, app, *args, **kwargs):
+        kwargs.setdefault("catch_exceptions", False)
+        return super().invoke(_click_command(app), *args, **kwargs)
+
+
 @pytest.fixture(scope="session")
 def cli():
-    """Shared CliRunner for all CLI tests."""
-    return CliRunner()
+    """Shared CliRunner for all CLI tests, with colours disabled at the source."""
+    return CachedCommandRunner(env={"NO_COLOR": "1", "TERM": "dumb"})
@@ -0,0 +1,34 @@
+"""Lightweight stand-ins and helpers for the DockerService tests."""
+
+from unittest.mock import create_autospec
+
+
+def mock_method(service, name, **kwargs):
+    """Replace service.<name> with an autospecced mock and return it.
+
+    The mock is built from the bound method, so calls are checked against
+    its real signature; kwargs (return_value, side_effect) go to the mock.
+    """
+    mock = create_autospec(getattr(service, name), **kwargs)
+    setattr(service, name, mock)
+    return mock
+
+
+def set_runner_nb(config_service, nb, idx=0):
+    """Set how many containers the idx-th runner group of the loaded config wants."""
+    config_service.load_config.return_value.runners[idx].nb = nb
+
+
+def snapshot(running=(), stopped=()):
+    """_snapshot_containers stand-in serving a fixed set of containers.
+
+    Like the real method, only the names containing the requested pattern
+    are returned, so each runner group sees its own containers.
+    """
+    containers = {
+        **{name: {"exists": True, "running": True, "id": name} for name in running},
+        **{name: {"exists": True, "running": False, "id": name} for name in stopped},
+    }
+    return lambda name_pattern: {
+        name: state for name, state in containers.items() if name_pattern in name
+    }
@@ -0,0 +1,61 @@
+"""
+Configuration for tests in the docker_service folder.
+
+This module opts the DockerService tests into autospec enforcement and
+provides in-memory files for the runners_config.yaml rewrite. Each test gets
+a fresh DockerService from the global ``docker_service`` fixture.
+"""
+
+import io
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _enforce_autospec(enforce_autospec):
+    """Apply the global enforce_autospec fixture to every test of this folder."""
+    yield
+
+
+class _WrittenFile(io.StringIO):
+    """StringIO whose content survives the `with` block that closes it."""
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def config_file_io():
+    """Patch open() with in-memory files.
+
+    Returns a function taking the text served to read-mode opens; it returns
+    the open() mock and the list of files opened for writing. os.replace and
+    shutil.copymode, used to move the rewritten file into place, are patched
+    out as well.
+    """
+    patchers = []
+
+    def _install(read_data):
+        written = []
+
+        def _open(_path, mode="r", *args, **kwargs):
+            if "r" in mode:
+                return io.StringIO(read_data)
+            written.append(_WrittenFile())
+            return written[-1]
+
+        patcher = patch("builtins.open", side_effect=_open)
+        file_patchers = (
+            patch("src.services.docker_service.os.replace"),
+            patch("src.services.docker_service.shutil.copymode"),
+        )
+        patchers.append(patcher)
+        for file_patcher in file_patchers:
+            patchers.append(file_patcher)
+            file_patcher.start()
+        return patcher.start(), written
+
+    yield _install
+    for patcher in patchers:
+        patcher.stop()
@@ -1,62 +1,78 @@
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
 import docker
 import pytest
 
-from src.services import ConfigService, DockerService
-
 
 @pytest.fixture
-def config_service(valid_config):
-    service = MagicMock(spec=ConfigService)
-    service.load_config.return_value = valid_config
-    return service
+def config_service(autospec_config_service):
+    return autospec_config_service
 
 
-@pytest.fixture
-def docker_service(config_service):
-    return DockerService(config_service)
+def _container(status="running"):
+    def setup(client):
+        client.containers.get.return_value = MagicMock(status=status)
 
+    return setup
 
-@pytest.fixture
-def mock_docker_client():
-    with patch("docker.from_env") as mock_docker:
-        client = MagicMock()
-        mock_docker.return_value = client
-        yield client
 
+def _get_raises(exc):
+    def setup(client):
+        client.containers.get.side_effect = exc
 
-@pytest.mark.parametrize("exists", [True, False])
-def test_container_exists(docker_service, mock_docker_client, exists):
-    if exists:
-        mock_docker_client.containers.get.return_value = MagicMock()
-    else:
-        mock_docker_client.containers.get.side_effect = Exception("not found")
-    assert docker_service.container_exists("c") is exists
+    return setup
 
 
-def test_container_exists_notfound(docker_service, mock_docker_client):
-    mock_docker_client.containers.get.side_effect = docker.errors.NotFound("nf")
-    assert docker_service.container_exists("c") is False
+def _images(*images, error=None):
+    def setup(client):
+        client.images.list.return_value = list(images)
+        client.images.list.side_effect = error
+
+    return setup
 
 
 @pytest.mark.parametrize(
-    "status,expected", [("running", True), ("stopped", False), (None, False)]
+    "method,setup,expected",
+    [
+        pytest.param("container_exists", _container(), True, id="exists"),
+        pytest.param(
+            "container_exists",
+            _get_raises(Exception("not found")),
+            False,
+            id="exists-error",
+        ),
+        pytest.param(
+            "container_exists",
+            _get_raises(docker.errors.NotFound("nf")),
+            False,
+            id="exists-notfound",
+        ),
+        pytest.param("container_running", _container(), True, id="running"),
+        pytest.param(
+            "container_running", _container("stopped"), False, id="running-stopped"
+        ),
+        pytest.param(
+            "container_running",
+            _get_raises(Exception("nf")),
+            False,
+            id="running-error",
+        ),
+        pytest.param(
+            "container_running",
+            _get_raises(docker.errors.NotFound("nf")),
+            False,
+            id="running-notfound",
+        ),
+        pytest.param("image_exists", _images(MagicMock()), True, id="image"),
+        pytest.param("image_exists", _images(), False, id="image-missing"),
+        pytest.param(
+            "image_exists", _images(error=Exception("boom")), False, id="image-error"
+        ),
+    ],
 )
-def test_container_running(docker_service, mock_docker_client, status, expected):
-    if status is None:
-        mock_docker_client.containers.get.side_effect = Exception("nf")
-    else:
-        cont = MagicMock()
-        cont.status = status
-        mock_docker_client.containers.get.return_value = cont
-    assert docker_service.container_running("c") is expected
-
-
-@pytest.mark.parametrize("present", [True, False])
-def test_image_exists(docker_service, mock_docker_client, present):
-    mock_docker_client.images.list.return_value = [MagicMock()] if present else []
-    assert docker_service.image_exists("img") is present
+def test_docker_probe(docker_service, mock_docker_client, method, setup, expected):
+    setup(mock_docker_client)
+    assert getattr(docker_service, method)("c") is expected
 
 
 @patch("subprocess.run")
@@ -65,37 +81,21 @@ def test_run_command(mock_run, docker_service):
     mock_run.assert_called_once()
 
 
-def test_container_running_notfound(docker_service, mock_docker_client):
-    mock_docker_client.containers.get.side_effect = docker.errors.NotFound("nf")
-    assert docker_service.container_running("c") is False
-
-
-def test_image_exists_exception(docker_service, mock_docker_client):
-    mock_docker_client.images.list.side_effect = Exception("boom")
-    assert docker_service.image_exists("img") is False
-
-
-def test_build_image_happy_path(docker_service):
-    with (
-        patch("docker.from_env") as mock_docker,
-        patch("builtins.open", mock_open(read_data=b"")),
-    ):
-        client = MagicMock()
-        api_client = MagicMock()
-        client.api = api_client
-        mock_docker.return_value = client
-        docker_service.build_image(
-            image_tag="python:3.11-2.300.0",
-            dockerfile_path="config/Dockerfile.node20",
-            build_dir="config",
-            build_args={"BASE_IMAGE": "ghcr.io/actions/runner:2.300.0"},
-        )
-        api_client.build.assert_called_once()
-        args, kwargs = api_client.build.call_args
-        assert kwargs["path"] == "config"
-        assert kwargs["dockerfile"] == "Dockerfile.node20"
-        assert kwargs["tag"] == "python:3.11-2.300.0"
-        assert kwargs["buildargs"] == {"BASE_IMAGE": "ghcr.io/actions/runner:2.300.0"}
+def test_build_image_happy_path(docker_service, mock_docker_client):
+    api_client = mock_docker_client.api
+    docker_service.build_image(
+        image_tag="python:3.11-2.300.0",
+        dockerfile_path="config/Dockerfile.node20",
+        build_dir="config",
+        build_args={"BASE_IMAGE": "ghcr.io/actions/runner:2.300.0"},
+    )
+    api_client.build.assert_called_once()
+    args, kwargs = api_client.build.call_args
+    assert kwargs["path"] == "config"
+    assert kwargs["dockerfile"] == "Dockerfile.node20"
+    assert kwargs["tag"] == "python:3.11-2.300.0"
+    assert kwargs["buildargs"] == {"BASE_IMAGE": "ghcr.io/actions/runner:2.300.0"}
+    assert kwargs["decode"] is False
 
 
 def test_run_container_command_building(docker_service):
@@ -133,16 +133,31 @@ def test_run_container_no_command_no_detach(docker_service):
         assert "/bin/bash" not in called_cmd
 
 
-def test_list_containers_filtering(docker_service):
-    with patch("docker.from_env") as mock_docker:
-        client = MagicMock()
-        mock_docker.return_value = client
-        c1 = MagicMock()
-        c1.name = "foo-1"
-        c2 = MagicMock()
-        c2.name = "bar-1"
-        client.containers.list.return_value = [c1, c2]
-        all_names = docker_service.list_containers()
-        assert set(all_names) == {"foo-1", "bar-1"}
-        filtered = docker_service.list_containers("foo-")
-        assert filtered == ["foo-1"]
+def test_list_containers_filtering(docker_service, mock_docker_client):
+    c1 = MagicMock()
+    c1.name = "foo-1"
+    c2 = MagicMock()
+    c2.name = "bar-1"
+    mock_docker_client.containers.list.return_value = [c1, c2]
+    all_names = docker_service.list_containers()
+    assert set(all_names) == {"foo-1", "bar-1"}
+    filtered = docker_service.list_containers("foo-")
+    assert filtered == ["foo-1"]
+
+
+def test_snapshot_containers(docker_service, mock_docker_client):
+    containers = []
+    for name, status in (("foo-1", "running"), ("foo-2", "exited"), ("xfoo", "x")):
+        c = MagicMock(status=status, id=f"id-{name}")
+        c.name = name
+        containers.append(c)
+    mock_docker_client.containers.list.return_value = containers
+    assert docker_service._snapshot_containers("foo-") == {
+        "foo-1": {"exists": True, "running": True, "id": "id-foo-1"},
+        "foo-2": {"exists": True, "running": False, "id": "id-foo-2"},
+    }
+    mock_docker_client.containers.list.assert_called_once_with(
+        all=True, filters={"name": "foo-"}
+    )
+    mock_docker_client.containers.list.side_effect = Exception("daemon down")
+    assert docker_service._snapshot_containers("foo-") == {}
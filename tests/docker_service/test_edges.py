@@ -1,28 +1,22 @@
-from unittest.mock import MagicMock, patch
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
-from src.services.config_service import ConfigService
 from src.services.docker_service import DockerService
 
 
 @pytest.fixture
-def config_service():
-    return MagicMock(spec=ConfigService)
+def config_service(autospec_config_service):
+    return autospec_config_service
 
 
-@pytest.fixture
-def docker_service(config_service):
-    return DockerService(config_service)
-
-
-@patch("requests.post")
 @patch("os.getenv", return_value="tok")
-def test_get_registration_token_org(_getenv, mock_post, docker_service):
-    resp = MagicMock()
-    resp.status_code = 201
-    resp.json.return_value = {"token": "abc"}
-    mock_post.return_value = resp
+def test_get_registration_token_org(_getenv, github_http, docker_service):
+    mock_post = github_http.post
+    mock_post.return_value.status_code = 201
+    mock_post.return_value.json.return_value = {"token": "abc"}
     tok = docker_service._get_registration_token("https://github.com/myorg/")
     assert tok == "abc"
     assert (
@@ -31,13 +25,11 @@ def test_get_registration_token_org(_getenv, mock_post, docker_service):
     )
 
 
-@patch("requests.post")
 @patch("os.getenv", return_value="tok")
-def test_get_registration_token_repo(_getenv, mock_post, docker_service):
-    resp = MagicMock()
-    resp.status_code = 201
-    resp.json.return_value = {"token": "xyz"}
-    mock_post.return_value = resp
+def test_get_registration_token_repo(_getenv, github_http, docker_service):
+    mock_post = github_http.post
+    mock_post.return_value.status_code = 201
+    mock_post.return_value.json.return_value = {"token": "xyz"}
     tok = docker_service._get_registration_token("https://github.com/owner/repo")
     assert tok == "xyz"
     assert (
@@ -46,19 +38,15 @@ def test_get_registration_token_repo(_getenv, mock_post, docker_service):
     )
 
 
-def test_get_registration_token_fail(docker_service):
+def test_get_registration_token_fail(github_http, docker_service):
     with patch("src.services.docker_service.time.sleep") as mock_sleep:
         with patch("os.getenv", return_value=None):
             with pytest.raises(Exception) as e:
                 docker_service._get_registration_token("https://github.com/test-org")
             assert "token GitHub n'est pas défini" in str(e.value)
-        mock_response = MagicMock()
-        mock_response.status_code = 400
-        mock_response.text = "fail"
-        with (
-            patch("os.getenv", return_value="tok"),
-            patch("requests.post", return_value=mock_response),
-        ):
+        github_http.post.return_value.status_code = 400
+        github_http.post.return_value.text = "fail"
+        with patch("os.getenv", return_value="tok"):
             with pytest.raises(Exception):
                 docker_service._get_registration_token(
                     "https://github.com/test-org", "tok"
@@ -66,45 +54,127 @@ def test_get_registration_token_fail(docker_service):
             assert mock_sleep.call_count == 3
 
 
-def test_exec_start_stop_remove_and_exceptions(docker_service):
-    from unittest.mock import mock_open
-
-    with (
-        patch("docker.from_env") as mock_docker,
-        patch("builtins.open", mock_open(read_data="")),
-    ):
-        client = MagicMock()
-        mock_docker.return_value = client
-        cont = MagicMock()
-        client.containers.get.return_value = cont
+def test_exec_start_stop_remove_and_exceptions(docker_service, mock_docker_client):
+    cont = mock_docker_client.containers.get.return_value
+    docker_service.exec_command("c", "ls")
+    cont.exec_run.assert_called_once()
+    docker_service.start_container("c")
+    assert cont.start.called
+    docker_service.stop_container("c")
+    assert cont.stop.called
+    docker_service.remove_container("c")
+    assert cont.remove.called
+    mock_docker_client.containers.get.side_effect = Exception("fail")
+    with pytest.raises(Exception):
         docker_service.exec_command("c", "ls")
-        cont.exec_run.assert_called_once()
+    with pytest.raises(Exception):
         docker_service.start_container("c")
-        assert cont.start.called
+    with pytest.raises(Exception):
         docker_service.stop_container("c")
-        assert cont.stop.called
+    with pytest.raises(Exception):
         docker_service.remove_container("c")
-        assert cont.remove.called
-    with patch("docker.from_env") as mock_docker:
-        client = MagicMock()
-        mock_docker.return_value = client
-        client.containers.get.side_effect = Exception("fail")
-        with pytest.raises(Exception):
-            docker_service.exec_command("c", "ls")
-        with pytest.raises(Exception):
-            docker_service.start_container("c")
-        with pytest.raises(Exception):
-            docker_service.stop_container("c")
-        with pytest.raises(Exception):
-            docker_service.remove_container("c")
-
-
-def test_get_latest_runner_version(docker_service):
-    with patch("requests.get") as mock_get:
-        resp = MagicMock()
-        resp.raise_for_status.return_value = None
-        resp.json.return_value = {"tag_name": "v2.300.0"}
-        mock_get.return_value = resp
+
+
+def test_get_latest_runner_version(github_http, docker_service):
+    github_http.get.return_value.json.return_value = {"tag_name": "v2.300.0"}
+    assert docker_service.get_latest_runner_version() == "2.300.0"
+    github_http.get.side_effect = Exception("fail")
+    # Servie depuis le cache tant que le TTL court
+    assert docker_service.get_latest_runner_version() == "2.300.0"
+    assert github_http.get.call_count == 1
+    docker_service.clear_version_cache()
+    assert docker_service.get_latest_runner_version() is None
+    assert docker_service.get_latest_runner_version() is None
+    assert github_http.get.call_count == 3
+
+
+def test_get_latest_runner_version_revalidates_with_etag(github_http, docker_service):
+    """TTL expiré : requête conditionnelle, un 304 garde la version en cache."""
+    resp = github_http.get.return_value
+    resp.json.return_value = {"tag_name": "v2.300.0"}
+    resp.headers = {"ETag": '"abc"'}
+    assert docker_service.get_latest_runner_version() == "2.300.0"
+    assert github_http.get.call_args.kwargs["headers"] == {}
+    resp.status_code = 304
+    resp.json.side_effect = AssertionError("304 has no body")
+    expired = time.monotonic() + DockerService.VERSION_CACHE_TTL
+    with patch("src.services.docker_service.time.monotonic", return_value=expired):
         assert docker_service.get_latest_runner_version() == "2.300.0"
-    with patch("requests.get", side_effect=Exception("fail")):
-        assert docker_service.get_latest_runner_version() is None
+    assert github_http.get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+    # Revalidée : de nouveau servie depuis le cache jusqu'au prochain TTL
+    with patch("src.services.docker_service.time.monotonic", return_value=expired):
+        assert docker_service.get_latest_runner_version() == "2.300.0"
+    assert github_http.get.call_count == 2
+
+
+def test_image_exists_cache(docker_service, mock_docker_client):
+    """image_exists interroge dockerd une fois par TTL, build_image invalide."""
+    mock_docker_client.images.list.return_value = []
+    assert docker_service.image_exists("img:1") is False
+    mock_docker_client.images.list.return_value = ["img"]
+    assert docker_service.image_exists("img:1") is False
+    assert mock_docker_client.images.list.call_count == 1
+    mock_docker_client.api.build.return_value = iter(())
+    docker_service.build_image("img:1", "config/Dockerfile", "config")
+    assert docker_service.image_exists("img:1") is True
+    with patch(
+        "src.services.docker_service.time.monotonic",
+        return_value=time.monotonic() + DockerService.IMAGE_CACHE_TTL,
+    ):
+        docker_service.image_exists("img:1")
+    assert mock_docker_client.images.list.call_count == 3
+
+
+def test_build_runner_images_image_size_exception(monkeypatch):
+    """Couvre le except Exception: image_size = 0 dans build_runner_images."""
+
+    class DummyConfig:
+        runners = [
+            SimpleNamespace(
+                build_image="Dockerfile",
+                techno="x",
+                techno_version="1",
+                name_prefix="foo",
+            )
+        ]
+        runners_defaults = SimpleNamespace(base_image="img:1.0.0")
+
+    class DummyConfigService:
+        def load_config(self):
+            return DummyConfig()
+
+    svc = DockerService(DummyConfigService())
+    monkeypatch.setattr(svc, "build_image", lambda **kwargs: None)
+
+    class DummyImages:
+        def get(self, tag):
+            raise Exception("fail")
+
+    class DummyClient:
+        images = DummyImages()
+
+    monkeypatch.setattr("docker.from_env", lambda: DummyClient())
+    result = svc.build_runner_images()
+    assert result["built"][0]["image_size"] == "0.00 B"
+
+
+@pytest.fixture(scope="module")
+def size_formatter():
+    """DockerService built once for the pure _format_size checks."""
+    return DockerService(lambda: None)
+
+
+@pytest.mark.parametrize(
+    "n,suffix",
+    [
+        (1, "B"),
+        (1024, "KB"),
+        (1024**2, "MB"),
+        (1024**3, "GB"),
+        (1024**4, "TB"),
+        (2**60, "PB"),
+    ],
+)
+def test_format_size(size_formatter, n, suffix):
+    """Couvre chaque unité de _format_size."""
+    assert size_formatter._format_size(n).endswith(f" {suffix}")
@@ -1,14 +1,16 @@
+import json
 from unittest.mock import MagicMock, patch
 
-from src.services import ConfigService, DockerService
+from src.services import DockerService
 
 
 def _build_stream(lines):
-    for line in lines:
-        yield {"stream": line + "\n"}
+    """Raw daemon output for the given lines, as a single bytes chunk."""
+    blob = "".join(json.dumps({"stream": line + "\n"}) + "\r\n" for line in lines)
+    return iter((blob.encode(),))
 
 
-def test_build_image_quiet_logger_filters():
+def test_build_image_quiet_logger_filters(stub_config_service, mock_docker_client):
     stream_lines = [
         "",
         "   ",
@@ -23,14 +25,9 @@ def test_build_image_quiet_logger_filters():
         "ERROR something failed",
         "SUCCESSFULLY starting deployment",
     ]
-    with patch("docker.from_env") as mock_docker, patch("builtins.print") as mock_print:
-        client = MagicMock()
-        api_client = MagicMock()
-        client.api = api_client
-        api_client.build.return_value = _build_stream(stream_lines)
-        mock_docker.return_value = client
-        config_service = MagicMock(spec=ConfigService)
-        docker_service = DockerService(config_service)
+    mock_docker_client.api.build.return_value = _build_stream(stream_lines)
+    docker_service = DockerService(stub_config_service)
+    with patch("builtins.print") as mock_print:
         docker_service.build_image(
             image_tag="python:latest",
             dockerfile_path="config/Dockerfile.node20",
@@ -50,39 +47,26 @@ def test_build_image_quiet_logger_filters():
     assert printed == expected
 
 
-def test_build_image_uses_docker_build_logger():
+def test_build_image_uses_docker_build_logger(stub_config_service, mock_docker_client):
+    mock_docker_client.api.build.return_value = []
+    docker_service = DockerService(stub_config_service)
     with patch(
         "src.services.docker_logger.DockerBuildLogger.get_logger"
     ) as mock_get_logger:
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        with patch("docker.from_env") as mock_docker:
-            client = MagicMock()
-            api_client = MagicMock()
-            api_client.build.return_value = []
-            client.api = api_client
-            mock_docker.return_value = client
-            config_service = MagicMock(spec=ConfigService)
-            docker_service = DockerService(config_service)
-            docker_service.build_image(
-                image_tag="test:latest",
-                dockerfile_path="test/Dockerfile",
-                build_dir="test",
-                quiet=True,
-            )
+        docker_service.build_image(
+            image_tag="test:latest",
+            dockerfile_path="test/Dockerfile",
+            build_dir="test",
+            quiet=True,
+        )
     mock_get_logger.assert_called_once_with(True)
 
 
-def test_build_image_default_logger_prints_all():
+def test_build_image_default_logger_prints_all(stub_config_service, mock_docker_client):
     stream_lines = ["one", "two", "three"]
-    with patch("docker.from_env") as mock_docker, patch("builtins.print") as mock_print:
-        client = MagicMock()
-        api_client = MagicMock()
-        client.api = api_client
-        api_client.build.return_value = _build_stream(stream_lines)
-        mock_docker.return_value = client
-        config_service = MagicMock(spec=ConfigService)
-        docker_service = DockerService(config_service)
+    mock_docker_client.api.build.return_value = _build_stream(stream_lines)
+    docker_service = DockerService(stub_config_service)
+    with patch("builtins.print") as mock_print:
         docker_service.build_image(
             image_tag="python:latest",
             dockerfile_path="config/Dockerfile.node20",
@@ -93,27 +77,18 @@ def test_build_image_default_logger_prints_all():
     assert printed == stream_lines
 
 
-def test_build_image_logger_none_triggers_get_logger():
-    with (
-        patch(
-            "src.services.docker_logger.DockerBuildLogger.get_logger"
-        ) as mock_get_logger,
-        patch("docker.from_env") as mock_docker,
-    ):
+def test_build_image_logger_none_triggers_get_logger(
+    stub_config_service, mock_docker_client
+):
+    mock_docker_client.api.build.return_value = _build_stream(
+        ["Step 1/1 : FROM python:3.11", "Successfully built abcdef"]
+    )
+    docker_service = DockerService(stub_config_service)
+    with patch(
+        "src.services.docker_logger.DockerBuildLogger.get_logger"
+    ) as mock_get_logger:
         mock_logger = MagicMock()
         mock_get_logger.return_value = mock_logger
-        client = MagicMock()
-        api_client = MagicMock()
-        api_client.build.return_value = iter(
-            [
-                {"stream": "Step 1/1 : FROM python:3.11\n"},
-                {"stream": "Successfully built abcdef\n"},
-            ]
-        )
-        client.api = api_client
-        mock_docker.return_value = client
-        config_service = MagicMock(spec=ConfigService)
-        docker_service = DockerService(config_service)
         docker_service.build_image(
             image_tag="img:tag",
             dockerfile_path="config/Dockerfile.node20",
@@ -126,39 +101,31 @@ def test_build_image_logger_none_triggers_get_logger():
         assert mock_logger.call_count == 2
 
 
-def test_build_image_logger_given_skips_get_logger_and_progress():
+def test_build_image_logger_given_skips_get_logger_and_progress(
+    stub_config_service, mock_docker_client
+):
+    mock_docker_client.api.build.return_value = _build_stream(
+        ["Step 1/1 : FROM python:3.11", "Successfully built abcdef"]
+    )
+    docker_service = DockerService(stub_config_service)
+    custom_logger = MagicMock()
     with (
         patch("src.services.docker_service.Progress") as mock_progress_cls,
-        patch("docker.from_env") as mock_docker,
+        patch(
+            "src.services.docker_logger.DockerBuildLogger.get_logger"
+        ) as mock_get_logger,
     ):
-        progress_instance = MagicMock()
+        progress_instance = mock_progress_cls.return_value
         progress_instance.__enter__.return_value = progress_instance
         progress_instance.__exit__.return_value = False
-        mock_progress_cls.return_value = progress_instance
-        client = MagicMock()
-        api_client = MagicMock()
-        api_client.build.return_value = iter(
-            [
-                {"stream": "Step 1/1 : FROM python:3.11\n"},
-                {"stream": "Successfully built abcdef\n"},
-            ]
+        docker_service.build_image(
+            image_tag="img:tag",
+            dockerfile_path="config/Dockerfile.node20",
+            build_dir="config",
+            logger=custom_logger,
+            quiet=True,
+            use_progress=True,
         )
-        client.api = api_client
-        mock_docker.return_value = client
-        config_service = MagicMock(spec=ConfigService)
-        docker_service = DockerService(config_service)
-        custom_logger = MagicMock()
-        with patch(
-            "src.services.docker_logger.DockerBuildLogger.get_logger"
-        ) as mock_get_logger:
-            docker_service.build_image(
-                image_tag="img:tag",
-                dockerfile_path="config/Dockerfile.node20",
-                build_dir="config",
-                logger=custom_logger,
-                quiet=True,
-                use_progress=True,
-            )
-            mock_get_logger.assert_not_called()
-        assert mock_progress_cls.called
-        assert custom_logger.call_count == 0
+        mock_get_logger.assert_not_called()
+    assert mock_progress_cls.called
+    assert custom_logger.call_count == 0
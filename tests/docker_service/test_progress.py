@@ -2,130 +2,94 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.services import ConfigService, DockerService
-
 
 @pytest.fixture
-def config_service(valid_config):
-    svc = MagicMock(spec=ConfigService)
-    svc.load_config.return_value = valid_config
-    return svc
+def config_service(stub_config_service):
+    return stub_config_service
 
 
-@pytest.fixture
-def docker_service(config_service):
-    return DockerService(config_service)
+# Sortie brute du daemon : un seul bloc d'octets, décodé par json_stream
+_PROGRESS_SUCCESS = (
+    b"null\r\n"
+    b'{"stream": "Step 1/3 : FROM base\\n"}\r\n'
+    b'{"stream": "Step 2/3 : RUN echo hi\\n"}\r\n'
+    b'{"stream": "Some other output\\n"}\r\n'
+    b'{"status": "Downloading", "progress": "[=====>     ]"}\r\n'
+    b'{"status": "Pull complete"}\r\n'
+    b'{"foo": "bar"}\r\n'
+    b'"raw-line"\r\n'
+)
 
 
-def _progress_stream_success():
-    yield None
-    yield {"stream": "Step 1/3 : FROM base\n"}
-    yield {"stream": "Step 2/3 : RUN echo hi\n"}
-    yield {"stream": "Some other output\n"}
-    yield {"status": "Downloading", "progress": "[=====>     ]"}
-    yield {"status": "Pull complete"}
-    yield {"foo": "bar"}
-    yield "raw-line"
+class DummyStream:
+    """Raw build response whose close() fails, yielding the given chunks.
 
+    Only used where the close() error path is exercised; other tests hand
+    build_image a plain iterator.
+    """
 
-class DummyStream:
-    def __init__(self, inner):
-        self._inner = iter(inner())
+    __slots__ = ("_inner",)
 
-    def __iter__(self):
-        return self
+    def __init__(self, payload):
+        self._inner = iter(payload)
 
-    def __next__(self):
-        return next(self._inner)
+    def __iter__(self):
+        return self._inner
 
     def close(self):
         raise Exception("close boom")
 
 
-def test_build_image_progress_success(docker_service):
-    with (
-        patch("docker.from_env") as mock_docker,
-        patch("src.services.docker_service.Progress") as mock_progress_cls,
-    ):
-        client = MagicMock()
-        api_client = MagicMock()
-        client.api = api_client
-        mock_docker.return_value = client
-        progress_instance = MagicMock()
-        progress_instance.__enter__.return_value = progress_instance
-        progress_instance.__exit__.return_value = False
-        mock_progress_cls.return_value = progress_instance
-        api_client.build.return_value = DummyStream(_progress_stream_success)
+@pytest.fixture
+def progress(monkeypatch):
+    """Rich Progress replaced by a MagicMock usable as a context manager."""
+    progress_instance = MagicMock()
+    progress_instance.__enter__.return_value = progress_instance
+    progress_instance.__exit__.return_value = False
+    monkeypatch.setattr(
+        "src.services.docker_service.Progress",
+        MagicMock(return_value=progress_instance),
+    )
+    return progress_instance
+
+
+def test_build_image_progress_success(docker_service, mock_docker_client, progress):
+    mock_docker_client.api.build.return_value = DummyStream((_PROGRESS_SUCCESS,))
+    docker_service.build_image(
+        image_tag="img:tag",
+        dockerfile_path="config/Dockerfile.node20",
+        build_dir="config",
+        use_progress=True,
+    )
+
+
+_PROGRESS_ERROR = (
+    b'{"stream": "Step 1/2 : FROM base\\n"}\r\n'
+    b'{"stream": "Step 2/2 : RUN something\\n"}\r\n'
+    b'{"error": "Docker build failed"}\r\n'
+)
+
+
+def test_build_image_progress_error(docker_service, mock_docker_client, progress):
+    mock_docker_client.api.build.return_value = iter((_PROGRESS_ERROR,))
+    with pytest.raises(Exception) as exc:
         docker_service.build_image(
             image_tag="img:tag",
             dockerfile_path="config/Dockerfile.node20",
             build_dir="config",
             use_progress=True,
         )
+    assert "Docker build failed" in str(exc.value)
 
 
-def _progress_stream_error():
-    yield {"stream": "Step 1/2 : FROM base\n"}
-    yield {"stream": "Step 2/2 : RUN something\n"}
-    yield {"error": "Docker build failed"}
-
-
-class DummyErrStream(DummyStream):
-    def __init__(self):
-        super().__init__(_progress_stream_error)
-
-
-def test_build_image_progress_error(docker_service):
-    with (
-        patch("docker.from_env") as mock_docker,
-        patch("src.services.docker_service.Progress") as mock_progress_cls,
-    ):
-        client = MagicMock()
-        api_client = MagicMock()
-        client.api = api_client
-        mock_docker.return_value = client
-        progress_instance = MagicMock()
-        progress_instance.__enter__.return_value = progress_instance
-        progress_instance.__exit__.return_value = False
-        mock_progress_cls.return_value = progress_instance
-        api_client.build.return_value = DummyErrStream()
-        with pytest.raises(Exception) as exc:
-            docker_service.build_image(
-                image_tag="img:tag",
-                dockerfile_path="config/Dockerfile.node20",
-                build_dir="config",
-                use_progress=True,
-            )
-        assert "Docker build failed" in str(exc.value)
-
-
-class NonProgressStream:
-    def __init__(self, chunks):
-        self._chunks = iter(chunks)
-
-    def __iter__(self):
-        return self
-
-    def __next__(self):
-        return next(self._chunks)
-
-    def close(self):
-        raise Exception("close failure")
-
-
-@patch("src.services.docker_service.docker.from_env")
-def test_build_image_nonprogress_error_path(mock_from_env, docker_service):
-    chunks = [
-        None,
-        {"status": "Downloading", "progress": "[====]"},
-        {"status": "Pull complete"},
-        {"error": "boom"},
-    ]
-    client = MagicMock()
-    api_client = MagicMock()
-    client.api = api_client
-    mock_from_env.return_value = client
-    api_client.build.return_value = NonProgressStream(chunks)
+def test_build_image_nonprogress_error_path(docker_service, mock_docker_client):
+    chunks = (
+        b"null\r\n"
+        b'{"status": "Downloading", "progress": "[====]"}\r\n'
+        b'{"status": "Pull complete"}\r\n'
+        b'{"error": "boom"}\r\n',
+    )
+    mock_docker_client.api.build.return_value = DummyStream(chunks)
     with pytest.raises(Exception) as exc:
         docker_service.build_image(
             image_tag="img:tag",
@@ -135,20 +99,12 @@ def test_build_image_nonprogress_error_path(mock_from_env, docker_service):
     assert "boom" in str(exc.value)
 
 
-@patch("src.services.docker_service.docker.from_env")
 @patch("builtins.print")
 def test_build_image_nonprogress_fallback_and_nondict(
-    mock_print, mock_from_env, docker_service
+    mock_print, docker_service, mock_docker_client
 ):
-    chunks = [
-        {"foo": "bar"},
-        "raw-line",
-    ]
-    client = MagicMock()
-    api_client = MagicMock()
-    client.api = api_client
-    mock_from_env.return_value = client
-    api_client.build.return_value = NonProgressStream(chunks)
+    chunks = (b'{"foo": "bar"}\r\n"raw-line"\r\n',)
+    mock_docker_client.api.build.return_value = iter(chunks)
     docker_service.build_image(
         image_tag="img:tag",
         dockerfile_path="config/Dockerfile.node20",
@@ -1,7 +1,10 @@
-from unittest.mock import MagicMock, mock_open, patch
+import stat
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from tests.docker_service._stubs import set_runner_nb, snapshot
+
 
 @patch("src.services.docker_service.DockerService.image_exists", return_value=False)
 @patch("src.services.docker_service.DockerService.build_image")
@@ -16,48 +19,6 @@ def test_start_runners_build_image_missing_techno(
     assert any("Build failed" in e["reason"] for e in res["errors"])
 
 
-@patch("pathlib.Path.exists", return_value=False)
-@pytest.mark.parametrize(
-    "containers",
-    [
-        ["test-runner-X", "test-runner-2"],
-        ["foo", "test-runner-2"],
-    ],
-)
-def test_start_runners_removes_expected(
-    _mock_path_exists, containers, docker_service, config_service
-):
-    docker_service.image_exists = MagicMock(return_value=True)
-    docker_service.build_image = MagicMock()
-    docker_service.list_containers = MagicMock(return_value=containers)
-    docker_service.container_running = MagicMock(return_value=False)
-    docker_service.remove_container = MagicMock()
-    docker_service.exec_command = MagicMock()
-    config_service.load_config.return_value.runners[0].nb = 1
-    res = docker_service.start_runners()
-    assert any(r.get("name") == "test-runner-2" for r in res["removed"]) or any(
-        r.get("id") == "test-runner-2" for r in res["removed"]
-    )
-
-
-@patch("pathlib.Path.exists", return_value=False)
-def test_start_runners_removal_exception(
-    _mock_path_exists, docker_service, config_service
-):
-    docker_service.image_exists = MagicMock(return_value=True)
-    docker_service.build_image = MagicMock()
-    docker_service.list_containers = MagicMock(return_value=["test-runner-2"])
-    docker_service.container_running = MagicMock(return_value=False)
-    docker_service.remove_container = MagicMock(side_effect=Exception("remove failed"))
-    docker_service.exec_command = MagicMock()
-    config_service.load_config.return_value.runners[0].nb = 1
-    res = docker_service.start_runners()
-    assert any(
-        r.get("operation") == "removal" and "remove failed" in r.get("reason", "")
-        for r in res["errors"]
-    )
-
-
 def test_start_runners_running_and_restarted(
     docker_service, config_service, mock_docker_client
 ):
@@ -72,19 +33,17 @@ def test_start_runners_running_and_restarted(
     # Préparation config
     cfg = config_service.load_config.return_value
     cfg.runners[0].nb = 2
-    # Construit l'image attendue pour ce runner (avec techno/php déjà dans la config fixture)
-    base_image = cfg.runners_defaults.base_image
-    m = __import__("re").search(r":([\d.]+)$", base_image)
-    runner_version = m.group(1) if m else "latest"
-    expected_image = (
-        f"{cfg.runners[0].techno}:{cfg.runners[0].techno_version}-{runner_version}"
-    )
+    # Image attendue pour ce runner, calculée comme dans start_runners
+    runner_version = docker_service._runner_version(cfg.runners_defaults.base_image)
+    expected_image = docker_service._expected_image_tag(cfg.runners[0], runner_version)
 
     # Mocks
     docker_service.image_exists = MagicMock(return_value=True)
     docker_service.build_image = MagicMock()
-    docker_service.container_exists = MagicMock(return_value=True)
-    docker_service.container_running = MagicMock(side_effect=[True, False])
+    prefix = cfg.runners[0].name_prefix
+    docker_service._snapshot_containers = snapshot(
+        running=[f"{prefix}-1"], stopped=[f"{prefix}-2"]
+    )
     docker_service.start_container = MagicMock()
 
     # Mock docker.from_env() client (fourni via fixture autouse mock_docker_client)
@@ -101,8 +60,6 @@ def test_start_runners_running_and_restarted(
         return DummyContainer(expected_image)
 
     mock_docker_client.containers.get.side_effect = get_side_effect
-    # list() peut être vide (pas d'extra containers)
-    mock_docker_client.containers.list.return_value = []
 
     res = docker_service.start_runners()
 
@@ -130,12 +87,13 @@ def test_start_runners_image_mismatch_redeploy(
             self.status = "running"
 
     mock_docker_client.containers.get.return_value = DummyContainer("old/other:image")
-    mock_docker_client.containers.list.return_value = []
 
     # Mocks sur méthodes utilisées
-    docker_service.container_exists = MagicMock(return_value=True)
-    docker_service.container_running = MagicMock(return_value=True)
-    docker_service.stop_container = MagicMock()
+    docker_service._snapshot_containers = snapshot(
+        running=[f"{cfg.runners[0].name_prefix}-1"]
+    )
+    stop_calls = []
+    docker_service.stop_container = stop_calls.append
     docker_service.exec_command = MagicMock(side_effect=Exception("fail remove"))
     docker_service.remove_container = MagicMock()
     docker_service.run_container = MagicMock()
@@ -149,49 +107,42 @@ def test_start_runners_image_mismatch_redeploy(
     # Vérifie qu'on a ajouté un started avec reason image updated
     assert any(r.get("reason") == "image updated" for r in res["started"])
     # stop_container doit être appelé au moins une fois avec le runner cible
-    assert any(
-        call.args[0] == f"{cfg.runners[0].name_prefix}-1"
-        for call in docker_service.stop_container.mock_calls
-    )
+    assert f"{cfg.runners[0].name_prefix}-1" in stop_calls
     docker_service.exec_command.assert_called_once()  # même si exception ignorée
     docker_service.remove_container.assert_called_once()
     docker_service.run_container.assert_called_once()
 
 
 def test_list_runners_status_stopped(docker_service, config_service):
-    docker_service.list_containers = MagicMock(return_value=["test-runner-1"])
-    docker_service.container_exists = MagicMock(return_value=True)
-    docker_service.container_running = MagicMock(return_value=False)
-    config_service.load_config.return_value.runners[0].nb = 1
+    docker_service._snapshot_containers = snapshot(stopped=["test-runner-php-1"])
+    set_runner_nb(config_service, 1)
     res = docker_service.list_runners()
     assert res["groups"][0]["runners"][0]["status"] == "stopped"
 
 
 def test_list_runners_extra_runners(docker_service, config_service):
-    docker_service.list_containers = MagicMock(
-        return_value=["foo", "test-runner-2", "test-runner-3"]
-    )
-    docker_service.container_exists = MagicMock(return_value=True)
-    docker_service.container_running = MagicMock(
-        side_effect=[False, False, False, False, True, False]
+    docker_service._snapshot_containers = snapshot(
+        running=["test-runner-node-2"],
+        stopped=["test-runner-php-1", "test-runner-php-2", "test-runner-php-3"],
     )
-    config_service.load_config.return_value.runners[0].nb = 1
+    set_runner_nb(config_service, 1)
     res = docker_service.list_runners()
     extra = res["groups"][0]["extra_runners"]
     assert any(
-        e["name"] == "test-runner-2" and e["status"] == "will_be_removed" for e in extra
+        e["name"] == "test-runner-php-2" and e["status"] == "will_be_removed"
+        for e in extra
     )
     assert any(
-        e["name"] == "test-runner-3" and e["status"] == "will_be_removed" for e in extra
+        e["name"] == "test-runner-php-3" and e["status"] == "will_be_removed"
+        for e in extra
     )
+    assert res["groups"][1]["extra_runners"] == [
+        {"id": 2, "name": "test-runner-node-2", "status": "running_will_be_removed"}
+    ]
 
 
-@patch("requests.get")
-def test_get_latest_runner_version_tag_none(mock_get, docker_service):
-    resp = MagicMock()
-    resp.raise_for_status.return_value = None
-    resp.json.return_value = {"tag_name": None}
-    mock_get.return_value = resp
+def test_get_latest_runner_version_tag_none(github_http, docker_service):
+    github_http.get.return_value.json.return_value = {"tag_name": None}
     assert docker_service.get_latest_runner_version() is None
 
 
@@ -199,30 +150,92 @@ def test_get_latest_runner_version_tag_none(mock_get, docker_service):
     "src.services.docker_service.DockerService.get_latest_runner_version",
     return_value="2.301.0",
 )
-@patch(
-    "builtins.open",
-    new_callable=mock_open,
-    read_data="foo: bar\nbase_image: ghcr.io/actions/runner:2.300.0\nother: val\n",
-)
 def test_check_base_image_update_else(
-    mock_openfile, _latest, docker_service, config_service
+    _latest, docker_service, config_service, config_file_io
 ):
+    _, written = config_file_io(
+        "foo: bar\nbase_image: ghcr.io/actions/runner:2.300.0\nother: val\n"
+    )
     config_service.load_config.return_value.runners_defaults.base_image = (
         "ghcr.io/actions/runner:2.300.0"
     )
     res = docker_service.check_base_image_update(auto_update=True)
     assert res["updated"] is True
-    handle = mock_openfile()
-    writes = [call[0][0] for call in handle.write.call_args_list]
-    assert any("foo: bar" in w or "other: val" in w for w in writes)
+    (out,) = written
+    content = out.getvalue()
+    assert "foo: bar\n" in content and "other: val\n" in content
 
 
-@patch("requests.post")
-def test_get_registration_token_token_not_string(mock_post, docker_service):
-    resp = MagicMock()
+@patch(
+    "src.services.docker_service.DockerService.get_latest_runner_version",
+    return_value="2.301.0",
+)
+def test_check_base_image_update_rewrites_file_atomically(
+    _latest, docker_service, config_service, tmp_path
+):
+    """Vrai fichier : commentaires conservés, aucun fichier temporaire laissé."""
+    path = tmp_path / "runners_config.yaml"
+    path.write_text("# runners\nbase_image: ghcr.io/actions/runner:2.300.0\n")
+    config_service.load_config.return_value.runners_defaults.base_image = (
+        "ghcr.io/actions/runner:2.300.0"
+    )
+    res = docker_service.check_base_image_update(str(path), auto_update=True)
+    assert res["updated"] is True
+    assert path.read_text() == (
+        "# runners\n  base_image: ghcr.io/actions/runner:2.301.0\n"
+    )
+    assert [p.name for p in tmp_path.iterdir()] == ["runners_config.yaml"]
+
+
+@patch(
+    "src.services.docker_service.DockerService.get_latest_runner_version",
+    return_value="2.301.0",
+)
+def test_check_base_image_update_keeps_symlink_and_mode(
+    _latest, docker_service, config_service, tmp_path
+):
+    """Le lien symbolique reste un lien, le fichier réel garde ses permissions."""
+    real = tmp_path / "real.yaml"
+    real.write_text("base_image: ghcr.io/actions/runner:2.300.0\n")
+    real.chmod(0o640)
+    link = tmp_path / "runners_config.yaml"
+    link.symlink_to(real)
+    config_service.load_config.return_value.runners_defaults.base_image = (
+        "ghcr.io/actions/runner:2.300.0"
+    )
+    res = docker_service.check_base_image_update(str(link), auto_update=True)
+    assert res["updated"] is True
+    assert link.is_symlink()
+    assert real.read_text() == "  base_image: ghcr.io/actions/runner:2.301.0\n"
+    assert stat.S_IMODE(real.stat().st_mode) == 0o640
+
+
+@patch(
+    "src.services.docker_service.DockerService.get_latest_runner_version",
+    return_value="2.301.0",
+)
+def test_check_base_image_update_removes_temp_file_on_failure(
+    _latest, docker_service, config_service, tmp_path
+):
+    """Un échec du remplacement ne laisse ni fichier temporaire ni config modifiée."""
+    path = tmp_path / "runners_config.yaml"
+    path.write_text("base_image: ghcr.io/actions/runner:2.300.0\n")
+    config_service.load_config.return_value.runners_defaults.base_image = (
+        "ghcr.io/actions/runner:2.300.0"
+    )
+    with patch(
+        "src.services.docker_service.os.replace", side_effect=OSError("disk full")
+    ):
+        res = docker_service.check_base_image_update(str(path), auto_update=True)
+    assert res["error"] == "disk full" and not res["updated"]
+    assert [p.name for p in tmp_path.iterdir()] == ["runners_config.yaml"]
+    assert path.read_text() == "base_image: ghcr.io/actions/runner:2.300.0\n"
+
+
+def test_get_registration_token_token_not_string(github_http, docker_service):
+    resp = github_http.post.return_value
     resp.status_code = 201
     resp.json.return_value = {"token": 12345}
-    mock_post.return_value = resp
     with pytest.raises(Exception) as exc:
         docker_service._get_registration_token(
             "https://github.com/org/test", github_personal_token="tok"
@@ -230,13 +243,8 @@ def test_get_registration_token_token_not_string(mock_post, docker_service):
     assert "Token returned by GitHub API is not a string" in str(exc.value)
 
 
-@patch("requests.get")
-def test_get_latest_runner_version_tag_string(mock_get, docker_service):
-    resp = MagicMock()
-    resp.raise_for_status.return_value = None
-    resp.json.return_value = {"tag_name": "v2.301.0"}
-    mock_get.return_value = resp
-    assert docker_service.get_latest_runner_version() == "2.301.0"
-    resp.json.return_value = {"tag_name": "2.301.0"}
-    mock_get.return_value = resp
+@pytest.mark.parametrize("tag", ["v2.301.0", "2.301.0"])
+def test_get_latest_runner_version_tag_string(github_http, docker_service, tag):
+    github_http.get.return_value.json.return_value = {"tag_name": tag}
     assert docker_service.get_latest_runner_version() == "2.301.0"
+    assert github_http.get.call_count == 1
@@ -1,22 +1,17 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
-from src.services import ConfigService, DockerService
+from src.services import DockerService
 
+_SINGLE_STEP = (
+    b'{"stream": "Step 3/10 : RUN echo \'hi\'\\n"}\r\n'
+    b'{"stream": "Step 4/10 : RUN echo \'bye\'\\n"}\r\n'
+)
 
-def _single_step_stream():
-    yield {"stream": "Step 3/10 : RUN echo 'hi'\n"}
-    yield {"stream": "Step 4/10 : RUN echo 'bye'\n"}
 
-
-def test_quiet_logger_early_return():
-    with patch("docker.from_env") as mock_docker, patch("builtins.print") as mock_print:
-        client = MagicMock()
-        api_client = MagicMock()
-        client.api = api_client
-        api_client.build.return_value = _single_step_stream()
-        mock_docker.return_value = client
-        config_service = MagicMock(spec=ConfigService)
-        docker_service = DockerService(config_service)
+def test_quiet_logger_early_return(stub_config_service, mock_docker_client):
+    mock_docker_client.api.build.return_value = iter((_SINGLE_STEP,))
+    docker_service = DockerService(stub_config_service)
+    with patch("builtins.print") as mock_print:
         docker_service.build_image(
             image_tag="img:tag",
             dockerfile_path="config/Dockerfile.node20",
@@ -1,15 +1,16 @@
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, call, patch
 
-from src.services.config_schema import FullConfig
+import pytest
+
+from tests.docker_service._stubs import mock_method, set_runner_nb, snapshot
 
 
 @patch("src.services.docker_service.DockerService.build_image")
 def test_build_runner_images_branches(
     mock_build, docker_service, config_service, valid_config
 ):
-    cfg_data = valid_config.model_dump()
-    cfg_data["runners"][0]["build_image"] = None
-    cfg = FullConfig.model_validate(cfg_data)
+    cfg = valid_config.model_copy(deep=True)
+    cfg.runners[0].build_image = None
     config_service.load_config.return_value = cfg
     try:
         docker_service.config_service.load_config.return_value = cfg
@@ -29,171 +30,283 @@ def test_build_runner_images_branches(
     assert res["errors"]
 
 
-def test_start_runners_branches(docker_service, config_service):
-    docker_service.image_exists = MagicMock(return_value=False)
-    docker_service.build_image = MagicMock(side_effect=Exception("fail"))
-    docker_service.list_containers = MagicMock(
-        return_value=["test-runner-1", "test-runner-X"]
-    )
-    docker_service.container_running = MagicMock(side_effect=[True, False])
-    docker_service.container_exists = MagicMock(side_effect=[True, False])
-    docker_service._get_registration_token = MagicMock(return_value="tok")
-    docker_service.run_container = MagicMock()
-    config_service.load_config.return_value.runners[0].nb = 1
-    res = docker_service.start_runners()
-    assert "errors" in res and "started" in res
-
-
-@patch("pathlib.Path.exists", return_value=True)
-@patch("src.services.docker_service.shutil.rmtree")
-def test_start_runners_removes_extra(
-    _mock_rmtree, _mock_path_exists, docker_service, config_service
-):
-    docker_service.list_containers = MagicMock(return_value=["test-runner-3"])
-    docker_service.container_running = MagicMock(return_value=True)
-    docker_service.image_exists = MagicMock(return_value=True)
-    docker_service.start_container = MagicMock()
-    docker_service.exec_command = MagicMock()
-    docker_service.remove_container = MagicMock()
-    config_service.load_config.return_value.runners[0].nb = 2
-    res = docker_service.start_runners()
-    assert res["removed"]
-    assert docker_service.remove_container.called
-
-
-def test_start_runners_creates_and_starts(docker_service, config_service):
-    docker_service.container_exists = MagicMock(return_value=False)
-    docker_service._get_registration_token = MagicMock(return_value="tok")
-    docker_service.run_container = MagicMock()
-    docker_service.image_exists = MagicMock(return_value=True)
-    docker_service.list_containers = MagicMock(return_value=[])
+_PHP_PREFIX = "test-runner-php"
+
+
+def _removed(*names):
+    return lambda removed: all({"name": n} in removed for n in names)
+
+
+# (mock_spec, nb du premier groupe, Path.exists, prédicats sur le résultat,
+#  prédicats sur les mocks) ; mock_spec : méthode -> kwargs de mock_method()
+START_CASES = [
+    pytest.param(
+        {
+            "image_exists": {"return_value": False},
+            "build_image": {"side_effect": Exception("fail")},
+            "_snapshot_containers": {
+                "side_effect": snapshot(
+                    running=["test-runner-php-1"], stopped=["test-runner-php-X"]
+                )
+            },
+            "_get_registration_token": {"return_value": "tok"},
+            "run_container": {},
+        },
+        1,
+        False,
+        {"errors": lambda v: v is not None, "started": lambda v: v is not None},
+        {},
+        id="branches",
+    ),
+    pytest.param(
+        {
+            "_snapshot_containers": {
+                "side_effect": snapshot(running=[f"{_PHP_PREFIX}-3"])
+            },
+            "image_exists": {"return_value": True},
+            "start_container": {},
+            "exec_command": {},
+            "remove_container": {},
+        },
+        2,
+        True,
+        {"removed": bool},
+        {"remove_container": lambda m: m.called},
+        id="removes-extra",
+    ),
+    pytest.param(
+        {
+            "_snapshot_containers": {"side_effect": snapshot()},
+            "_get_registration_token": {"return_value": "tok"},
+            "run_container": {},
+            "image_exists": {"return_value": True},
+        },
+        1,
+        False,
+        {"started": bool},
+        {},
+        id="creates-and-starts",
+    ),
+    pytest.param(
+        {
+            "_snapshot_containers": {
+                "side_effect": snapshot(running=[f"{_PHP_PREFIX}-3"])
+            },
+            "image_exists": {"return_value": True},
+            "start_container": {},
+            "exec_command": {},
+            "remove_container": {},
+            "run_container": {},
+            "_get_registration_token": {"return_value": "tok"},
+        },
+        2,
+        False,
+        {"removed": _removed(f"{_PHP_PREFIX}-3")},
+        # Un extra déjà démarré n'est pas redémarré avant suppression
+        {
+            "start_container": lambda m: not m.called,
+            "exec_command": lambda m: m.call_count == 1,
+            "remove_container": lambda m: m.call_count == 1,
+        },
+        id="extra-running",
+    ),
+    pytest.param(
+        {
+            "_snapshot_containers": {
+                "side_effect": snapshot(stopped=[f"{_PHP_PREFIX}-4"])
+            },
+            "image_exists": {"return_value": True},
+            "start_container": {},
+            "exec_command": {},
+            "remove_container": {},
+            "run_container": {},
+            "_get_registration_token": {"return_value": "tok"},
+        },
+        3,
+        False,
+        {"removed": _removed(f"{_PHP_PREFIX}-4")},
+        # Un extra arrêté est démarré pour être désenregistré
+        {
+            "start_container": lambda m: m.call_args_list == [call(f"{_PHP_PREFIX}-4")],
+            "exec_command": lambda m: m.call_count == 1,
+            "remove_container": lambda m: m.call_count == 1,
+        },
+        id="extra-stopped",
+    ),
+    pytest.param(
+        {
+            "image_exists": {"return_value": True},
+            "build_image": {},
+            "_snapshot_containers": {
+                "side_effect": snapshot(
+                    stopped=[f"{_PHP_PREFIX}-X", f"{_PHP_PREFIX}-2"]
+                )
+            },
+            "remove_container": {},
+            "exec_command": {},
+        },
+        1,
+        False,
+        {"removed": _removed(f"{_PHP_PREFIX}-2")},
+        {},
+        id="removes-expected",
+    ),
+    pytest.param(
+        {
+            "image_exists": {"return_value": True},
+            "build_image": {},
+            "_snapshot_containers": {
+                "side_effect": snapshot(stopped=[f"{_PHP_PREFIX}-2"])
+            },
+            "remove_container": {"side_effect": Exception("remove failed")},
+            "exec_command": {},
+        },
+        1,
+        False,
+        {
+            "errors": lambda errors: any(
+                e.get("operation") == "removal"
+                and "remove failed" in e.get("reason", "")
+                for e in errors
+            )
+        },
+        {},
+        id="removal-exception",
+    ),
+]
+
+
+@pytest.fixture
+def configured_docker_service(docker_service, config_service, mock_spec, nb):
+    """docker_service with the methods of the case's mock_spec replaced."""
+    for name, kwargs in mock_spec.items():
+        mock_method(docker_service, name, **kwargs)
+    set_runner_nb(config_service, nb)
+    return docker_service
+
+
+@pytest.mark.parametrize("mock_spec,nb,path_exists,expected,mock_checks", START_CASES)
+def test_start_runners(configured_docker_service, path_exists, expected, mock_checks):
+    svc = configured_docker_service
+    with (
+        patch("pathlib.Path.exists", return_value=path_exists),
+        patch("src.services.docker_service.shutil.rmtree"),
+    ):
+        res = svc.start_runners()
+    for key, pred in expected.items():
+        assert pred(res[key]), (key, res[key])
+    for name, pred in mock_checks.items():
+        assert pred(getattr(svc, name)), name
+
+
+def _single_php_runner(config_service):
+    """Keep only the php group with one runner, so one branch runs per test."""
     cfg = config_service.load_config.return_value
+    cfg.runners = cfg.runners[:1]
     cfg.runners[0].nb = 1
-    res = docker_service.start_runners()
-    assert res["started"]
 
 
-def test_start_runners_extra_running_does_not_start_before_remove(
-    docker_service, config_service
-):
-    # Arrange: one extra container already RUNNING
-    prefix = config_service.load_config.return_value.runners[0].name_prefix
-    extra_name = f"{prefix}-3"
-
-    # Return extra only for the matching group
-    docker_service.list_containers = MagicMock(
-        side_effect=lambda pattern=None: (
-            [extra_name] if pattern and pattern.startswith(prefix + "-") else []
-        )
-    )
-    docker_service.container_running = MagicMock(return_value=True)
-    docker_service.image_exists = MagicMock(return_value=True)
-    docker_service.start_container = MagicMock()
-    docker_service.exec_command = MagicMock()
-    docker_service.remove_container = MagicMock()
-    # Avoid creating regular runners 1..nb
-    docker_service.container_exists = MagicMock(return_value=False)
-    docker_service.run_container = MagicMock()
-    docker_service._get_registration_token = MagicMock(return_value="tok")
+_PHP_1 = f"{_PHP_PREFIX}-1"
 
-    # Keep a small nb so idx>nb is true for extra_name
-    config_service.load_config.return_value.runners[0].nb = 2
 
-    # Act
-    res = docker_service.start_runners()
-
-    # Assert: it was removed, but start_container was NOT called on a running extra
-    assert {"name": extra_name} in res["removed"]
-    docker_service.start_container.assert_not_called()
-    docker_service.exec_command.assert_called_once()
-    docker_service.remove_container.assert_called_once()
-
-
-def test_start_runners_extra_stopped_starts_before_remove(
-    docker_service, config_service
+@pytest.mark.parametrize(
+    "containers,stop,outcome",
+    [
+        pytest.param(snapshot(running=[_PHP_1]), {}, "stopped", id="running"),
+        pytest.param(snapshot(stopped=[_PHP_1]), {}, "skipped", id="stopped"),
+        pytest.param(snapshot(), {}, "skipped", id="absent"),
+        pytest.param(
+            snapshot(running=[_PHP_1]),
+            {"side_effect": Exception("fail")},
+            "errors",
+            id="error",
+        ),
+    ],
+)
+def test_stop_runners_branches(
+    docker_service, config_service, containers, stop, outcome
 ):
-    # Arrange: one extra container STOPPED
-    prefix = config_service.load_config.return_value.runners[0].name_prefix
-    extra_name = f"{prefix}-4"
-
-    docker_service.list_containers = MagicMock(
-        side_effect=lambda pattern=None: (
-            [extra_name] if pattern and pattern.startswith(prefix + "-") else []
-        )
-    )
-    docker_service.container_running = MagicMock(return_value=False)
-    docker_service.image_exists = MagicMock(return_value=True)
-    docker_service.start_container = MagicMock()
-    docker_service.exec_command = MagicMock()
-    docker_service.remove_container = MagicMock()
-    # Avoid creating regular runners 1..nb
-    docker_service.container_exists = MagicMock(return_value=False)
-    docker_service.run_container = MagicMock()
-    docker_service._get_registration_token = MagicMock(return_value="tok")
-
-    config_service.load_config.return_value.runners[0].nb = 3
-
-    # Act
-    res = docker_service.start_runners()
-
-    # Assert: it was removed, and start_container was called because it was stopped
-    assert {"name": extra_name} in res["removed"]
-    docker_service.start_container.assert_called_once_with(extra_name)
-    docker_service.exec_command.assert_called_once()
-    docker_service.remove_container.assert_called_once()
-
-
-def test_stop_runners_branches(docker_service, config_service):
-    docker_service.container_running = MagicMock(
-        side_effect=[True, False, Exception("fail")]
-    )
-    docker_service.stop_container = MagicMock()
-    config_service.load_config.return_value.runners[0].nb = 3
+    docker_service._snapshot_containers = containers
+    mock_method(docker_service, "stop_container", **stop)
+    _single_php_runner(config_service)
     res = docker_service.stop_runners()
-    assert res["stopped"] and res["skipped"] and res["errors"]
-
-
-def test_remove_runners_branches(docker_service, config_service):
-    docker_service.container_exists = MagicMock(side_effect=[True, False, True])
-    docker_service.container_running = MagicMock(return_value=False)
-    docker_service.start_container = MagicMock()
-    docker_service.exec_command = MagicMock()
-    docker_service.remove_container = MagicMock()
-    config_service.load_config.return_value.runners[0].nb = 3
+    assert [r["name"] for r in res.pop(outcome)] == [_PHP_1]
+    assert not any(res.values())
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_stop_runners_keeps_config_order(docker_service, config_service, max_workers):
+    """Stops run on the thread pool, the report keeps the configuration order."""
+    docker_service.max_workers = max_workers
+    set_runner_nb(config_service, 3)
+    names = [f"{_PHP_PREFIX}-{i}" for i in (1, 2, 3)] + ["test-runner-node-1"]
+    docker_service._snapshot_containers = snapshot(running=names)
+    mock_method(docker_service, "stop_container")
+    res = docker_service.stop_runners()
+    assert [r["name"] for r in res["stopped"]] == names
+    assert docker_service.stop_container.call_count == 4
+
+
+@pytest.mark.parametrize(
+    "containers,remove,outcome",
+    [
+        pytest.param(snapshot(stopped=[_PHP_1]), {}, "removed", id="exists"),
+        pytest.param(snapshot(), {}, "skipped", id="absent"),
+        pytest.param(
+            snapshot(stopped=[_PHP_1]),
+            {"side_effect": Exception("fail")},
+            "errors",
+            id="error",
+        ),
+    ],
+)
+def test_remove_runners_branches(
+    docker_service, config_service, containers, remove, outcome
+):
+    docker_service._snapshot_containers = containers
+    mock_method(docker_service, "start_container")
+    mock_method(docker_service, "exec_command")
+    mock_method(docker_service, "remove_container", **remove)
+    _single_php_runner(config_service)
     res = docker_service.remove_runners()
-    assert res["removed"] and res["skipped"] and "errors" in res
+    (entry,) = res.pop(outcome)
+    assert entry.get("name", entry.get("container")) == _PHP_1
+    assert not any(res.values())
+    # Un runner arrêté est démarré pour pouvoir se désenregistrer
+    assert docker_service.start_container.called == (outcome != "skipped")
 
 
 def test_remove_runners_running_branch(docker_service, config_service):
-    docker_service.container_exists = MagicMock(return_value=True)
-    docker_service.container_running = MagicMock(return_value=True)
-    docker_service.stop_container = MagicMock()
+    docker_service._snapshot_containers = snapshot(running=[_PHP_1])
+    docker_service.start_container = MagicMock()
     docker_service.exec_command = MagicMock()
     docker_service.remove_container = MagicMock()
-    config_service.load_config.return_value.runners[0].nb = 1
+    set_runner_nb(config_service, 1)
     res = docker_service.remove_runners()
     assert res["removed"]
+    docker_service.start_container.assert_not_called()
 
 
 def test_remove_runners_error_branch(docker_service, config_service):
-    docker_service.container_exists = MagicMock(return_value=True)
-    docker_service.container_running = MagicMock(side_effect=Exception("oops"))
-    config_service.load_config.return_value.runners[0].nb = 1
+    docker_service._snapshot_containers = snapshot(running=[_PHP_1])
+    docker_service.exec_command = MagicMock(side_effect=Exception("oops"))
+    set_runner_nb(config_service, 1)
     res = docker_service.remove_runners()
     assert res["errors"]
 
 
 def test_list_runners_branches(docker_service, config_service):
-    docker_service.list_containers = MagicMock(
-        return_value=["test-runner-1", "test-runner-2", "test-runner-X"]
-    )
-    docker_service.container_exists = MagicMock(
-        side_effect=[True, False, True, False, True, False]
+    docker_service._snapshot_containers = snapshot(
+        running=[_PHP_1], stopped=[f"{_PHP_PREFIX}-3", f"{_PHP_PREFIX}-X"]
     )
-    docker_service.container_running = MagicMock(side_effect=[True, False, True, False])
-    config_service.load_config.return_value.runners[0].nb = 2
+    set_runner_nb(config_service, 2)
     res = docker_service.list_runners()
-    assert "groups" in res and "total" in res
+    php = res["groups"][0]
+    assert [r["status"] for r in php["runners"]] == ["running", "absent"]
+    assert php["extra_runners"] == [
+        {"id": 3, "name": f"{_PHP_PREFIX}-3", "status": "will_be_removed"}
+    ]
+    assert res["total"] == {"count": 3, "running": 1}
 
 
 @patch(
@@ -212,18 +325,17 @@ def test_check_base_image_update_branches_none(_latest, docker_service, config_s
     "src.services.docker_service.DockerService.get_latest_runner_version",
     return_value="2.301.0",
 )
-@patch(
-    "builtins.open",
-    new_callable=mock_open,
-    read_data="base_image: ghcr.io/actions/runner:2.300.0\n",
-)
 def test_check_base_image_update_auto_update(
-    mock_openfile, _latest, docker_service, config_service
+    _latest, docker_service, config_service, config_file_io
 ):
+    mock_openfile, written = config_file_io(
+        "base_image: ghcr.io/actions/runner:2.300.0\n"
+    )
     config_service.load_config.return_value.runners_defaults.base_image = (
         "ghcr.io/actions/runner:2.300.0"
     )
     assert docker_service.check_base_image_update(auto_update=True)["updated"]
+    assert written[0].getvalue() == "  base_image: ghcr.io/actions/runner:2.301.0\n"
     mock_openfile.side_effect = Exception("fail")
     assert docker_service.check_base_image_update(auto_update=True)["error"]
 
@@ -245,12 +357,10 @@ def test_check_base_image_update_no_change(_latest, docker_service, config_servi
 def test_start_runners_extra_not_removed_when_index_not_greater(
     docker_service, config_service
 ):
-    docker_service.image_exists = MagicMock(return_value=True)
-    docker_service.list_containers = MagicMock(
-        return_value=["test-runner-1", "test-runner-2"]
+    mock_method(docker_service, "image_exists", return_value=True)
+    docker_service._snapshot_containers = snapshot(
+        running=["test-runner-1", "test-runner-2"]
     )
-    docker_service.container_exists = MagicMock(return_value=True)
-    docker_service.container_running = MagicMock(return_value=True)
 
     # Patch la config pour n'avoir qu'un seul runner fictif
     class DummyRunner:
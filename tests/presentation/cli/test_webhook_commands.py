@@ -4,7 +4,6 @@ Optimized for clarity and maintainability.
 """
 
 import pytest
-from typer.testing import CliRunner
 
 from src.presentation.cli import commands, webhook_commands
 
@@ -50,7 +49,7 @@ def test_debug_test_all_templates_called(monkeypatch, called_dict):
     assert called_dict["console"] is not None
 
 
-def test_webhook_test_cli_on_main_app(monkeypatch, called_dict):
+def test_webhook_test_cli_on_main_app(monkeypatch, called_dict, cli):
     """Test CLI 'webhook test' command invokes test_webhooks."""
 
     def fake_test_webhooks(config_service, event_type, provider, interactive, console):
@@ -58,14 +57,13 @@ def test_webhook_test_cli_on_main_app(monkeypatch, called_dict):
 
     monkeypatch.setattr(commands, "test_webhooks", fake_test_webhooks)
     monkeypatch.setattr(commands, "console", object())
-    runner = CliRunner()
-    result = runner.invoke(
+    result = cli.invoke(
         commands.app, ["webhook", "test", "--event", "evt", "--provider", "prov"]
     )
     assert result.exit_code == 0
 
 
-def test_webhook_test_all_cli_on_main_app(monkeypatch, called_dict):
+def test_webhook_test_all_cli_on_main_app(monkeypatch, called_dict, cli):
     """Test CLI 'webhook test-all' command invokes debug_test_all_templates."""
 
     def fake_debug_test_all_templates(config_service, provider, console):
@@ -75,6 +73,5 @@ def test_webhook_test_all_cli_on_main_app(monkeypatch, called_dict):
         commands, "debug_test_all_templates", fake_debug_test_all_templates
     )
     monkeypatch.setattr(commands, "console", object())
-    runner = CliRunner()
-    result = runner.invoke(commands.app, ["webhook", "test-all", "--provider", "prov"])
+    result = cli.invoke(commands.app, ["webhook", "test-all", "--provider", "prov"])
     assert result.exit_code == 0
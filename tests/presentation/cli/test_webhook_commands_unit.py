@@ -36,7 +36,7 @@ def dummy_webhook_service():
             self.providers = providers or {}
             self._send_notification = lambda *a, **k: True
 
-        def notify(self, event_type, data, provider=None):
+        def notify_sync(self, event_type, data, provider=None):
             return {provider or "slack": True}
 
     return DummyWebhookService
@@ -182,7 +182,7 @@ def test_affichage_resultats(monkeypatch, dummy_config, dummy_webhook_service):
     class DummyWS:
         providers = {"slack": {}}
 
-        def notify(self, event_type, data, provider=None):
+        def notify_sync(self, event_type, data, provider=None):
             return {"slack": True, "teams": False}
 
     monkeypatch.setattr(webhook_commands, "WebhookService", lambda *a, **k: DummyWS())
@@ -290,7 +290,7 @@ class DummyWebhookService:
         self.providers = providers or {}
         self._send_notification = lambda *a, **k: True
 
-    def notify(self, event_type, data, provider=None):
+    def notify_sync(self, event_type, data, provider=None):
         return {provider or "slack": True}
 
 
@@ -108,6 +108,21 @@ def test_init_webhooks_disabled_does_not_call_build_and_register(
     assert called["called"] is False
 
 
+def test_flush_and_close_delegate_to_webhook_service(empty_config_service):
+    from unittest.mock import MagicMock
+
+    from src.services.notification_service import NotificationService
+
+    ns = NotificationService(empty_config_service)
+    ns.flush()  # Sans service webhook : rien à faire
+    ns.close()
+    ns.webhook_service = MagicMock()
+    ns.flush(timeout=3)
+    ns.webhook_service.flush.assert_called_once_with(timeout=3)
+    ns.close()
+    ns.webhook_service.close.assert_called_once_with()
+
+
 def test_emit_no_webhook_service(empty_config_service):
     from src.services.notification_service import NotificationService
 
@@ -54,6 +54,42 @@ def test_init_enabled_true_inits_only_enabled_providers(service):
     assert "slack" in svc.providers and "discord" not in svc.providers
 
 
+def test_prewarm_opens_connection_per_provider(monkeypatch, service):
+    """Test enabled providers get a pre-warm HEAD request when prewarm is on."""
+    heads = []
+    monkeypatch.setattr(
+        "requests.Session.head", lambda self, url, **k: heads.append(url)
+    )
+    svc = service(
+        {
+            "enabled": True,
+            "prewarm": True,
+            "slack": {"enabled": True, "webhook_url": "http://slack", "events": []},
+            "teams": {"enabled": True, "events": []},
+        }
+    )
+    svc.close()
+    assert heads == ["http://slack"]
+
+
+def test_prewarm_failure_is_ignored(monkeypatch, service):
+    """Test a failing pre-warm does not break the service."""
+
+    def boom(self, url, **k):
+        raise ConnectionError("unreachable")
+
+    monkeypatch.setattr("requests.Session.head", boom)
+    svc = service(
+        {
+            "enabled": True,
+            "prewarm": True,
+            "slack": {"enabled": True, "webhook_url": "http://slack", "events": []},
+        }
+    )
+    svc.close()
+    assert "slack" in svc.providers
+
+
 def test_notify_not_enabled_returns_empty(monkeypatch, service):
     """Test notify returns empty if service is not enabled."""
     svc = service({"enabled": False})
@@ -100,10 +136,192 @@ def test_notify_success_with_provider_filter(monkeypatch, service):
         }
     )
     monkeypatch.setattr(svc, "_send_notification", lambda *a, **k: True)
-    res = svc.notify("runner_started", {"runner_id": "x"}, provider="slack")
+    res = svc.notify_sync("runner_started", {"runner_id": "x"}, provider="slack")
     assert res == {"slack": True}
 
 
+def test_notify_routes_only_to_subscribed_providers(monkeypatch, service):
+    """Test notify only delivers to providers subscribed to the event."""
+    svc = service(
+        {
+            "enabled": True,
+            "slack": {"enabled": True, "webhook_url": "http://s", "events": ["a", "b"]},
+            "discord": {"enabled": True, "webhook_url": "http://d", "events": ["b"]},
+            "teams": {"enabled": True, "webhook_url": "http://t", "events": []},
+        }
+    )
+    sent = []
+    monkeypatch.setattr(
+        svc, "_send_notification", lambda p, e, d, c: sent.append(p) or True
+    )
+    assert svc.notify_sync("a", {}) == {"slack": True}
+    assert svc.notify_sync("b", {}) == {"slack": True, "discord": True}
+    assert svc.notify_sync("b", {}, provider="teams") == {}
+    assert sorted(sent) == ["discord", "slack", "slack"]
+
+
+def test_notify_returns_pending_deliveries(monkeypatch, service):
+    """Test notify queues deliveries and returns futures without blocking."""
+    svc = service(
+        {
+            "enabled": True,
+            "slack": {
+                "enabled": True,
+                "webhook_url": "http://u",
+                "events": ["runner_started"],
+            },
+        }
+    )
+    monkeypatch.setattr(svc, "_send_notification", lambda *a, **k: True)
+    with svc:
+        futures = svc.notify("runner_started", {"runner_id": "x"})
+        assert set(futures) == {"slack"}
+        assert futures["slack"].result(timeout=5) is True
+
+
+def test_close_drains_queued_notifications(monkeypatch, service):
+    """Test close waits for queued deliveries before returning."""
+    svc = service(
+        {
+            "enabled": True,
+            "slack": {"enabled": True, "webhook_url": "http://u", "events": ["e"]},
+        }
+    )
+    sent = []
+    monkeypatch.setattr(
+        svc, "_send_notification", lambda p, e, d, c: sent.append(d) or True
+    )
+    futures = [svc.notify("e", {"n": i})["slack"] for i in range(5)]
+    svc.close()
+    assert all(f.done() for f in futures)
+    assert sorted(d["n"] for d in sent) == list(range(5))
+
+
+def test_disabled_service_starts_no_workers(service):
+    """Test a disabled service never creates its pool nor its HTTP session."""
+    svc = service({"enabled": False})
+    svc.notify("runner_started", {})
+    svc.flush()
+    svc.close()
+    assert svc._executor is None and svc._session is None
+
+
+def test_pool_created_on_first_notification(monkeypatch, service):
+    """Test the worker pool only starts when a delivery is queued."""
+    svc = service(
+        {
+            "enabled": True,
+            "slack": {"enabled": True, "webhook_url": "http://u", "events": ["e"]},
+        }
+    )
+    assert svc._executor is None
+    monkeypatch.setattr(svc, "_send_notification", lambda *a, **k: True)
+    assert svc.notify_sync("e", {}) == {"slack": True}
+    assert svc._executor is not None
+    svc.close()
+
+
+def test_notify_after_close_is_ignored(monkeypatch, service, caplog):
+    """Test notifying a closed service logs and returns no delivery."""
+    svc = service(
+        {
+            "enabled": True,
+            "slack": {"enabled": True, "webhook_url": "http://u", "events": ["e"]},
+        }
+    )
+    monkeypatch.setattr(svc, "_send_notification", lambda *a, **k: True)
+    svc.notify_sync("e", {})
+    svc.close()
+    assert svc.notify("e", {}) == {}
+    assert "closed" in caplog.text
+
+
+def test_bulkhead_queues_deliveries_over_provider_quota(monkeypatch, service):
+    """Test a provider cannot hold more workers than its max_concurrency."""
+    import threading
+
+    svc = service(
+        {
+            "enabled": True,
+            "slack": {
+                "enabled": True,
+                "webhook_url": "http://u",
+                "events": ["e"],
+                "max_concurrency": 1,
+            },
+        }
+    )
+    started, release = threading.Event(), threading.Event()
+    in_flight, peak = [0], [0]
+
+    def slow_send(*a, **k):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        started.set()
+        release.wait(timeout=5)
+        in_flight[0] -= 1
+        return True
+
+    monkeypatch.setattr(svc, "_send_notification", slow_send)
+    with svc:
+        first = svc.notify("e", {})["slack"]
+        assert started.wait(timeout=5)
+        queued = [svc.notify("e", {})["slack"] for _ in range(3)]
+        assert not any(f.done() for f in queued)
+        release.set()
+        assert [f.result(timeout=5) for f in [first, *queued]] == [True] * 4
+    assert peak[0] == 1
+
+
+def test_bulkhead_drops_deliveries_when_queue_full(monkeypatch, service, caplog):
+    """Test deliveries are only dropped once the provider queue is full."""
+    import threading
+
+    svc = service(
+        {
+            "enabled": True,
+            "slack": {
+                "enabled": True,
+                "webhook_url": "http://u",
+                "events": ["e"],
+                "max_concurrency": 1,
+                "max_queue": 1,
+            },
+        }
+    )
+    started, release = threading.Event(), threading.Event()
+
+    def slow_send(*a, **k):
+        started.set()
+        release.wait(timeout=5)
+        return True
+
+    monkeypatch.setattr(svc, "_send_notification", slow_send)
+    with svc:
+        first = svc.notify("e", {})["slack"]
+        assert started.wait(timeout=5)
+        queued = svc.notify("e", {})["slack"]
+        dropped = svc.notify("e", {})["slack"]
+        assert dropped.result(timeout=5) is False
+        assert "queue full" in caplog.text
+        release.set()
+        assert first.result(timeout=5) is True
+        assert queued.result(timeout=5) is True
+
+
+def test_default_provider_quota_is_half_the_pool(service):
+    """Test a provider holds at most half of the workers by default."""
+    svc = service(
+        {
+            "enabled": True,
+            "workers": 4,
+            "slack": {"enabled": True, "webhook_url": "http://u", "events": []},
+        }
+    )
+    assert svc._concurrency == {"slack": 2}
+    svc.close()
+
+
 def test_send_notification_missing_url_returns_false(service):
     """Test _send_notification returns False if webhook_url is missing."""
     svc = service({"enabled": True})
@@ -128,6 +346,43 @@ def test_send_notification_per_provider_uses_formatter(monkeypatch, provider, se
     )
 
 
+def test_send_notification_uses_renderer_compiled_at_init(monkeypatch, service):
+    """Test configured providers reuse the payload renderer compiled at init."""
+    svc = service(
+        {
+            "enabled": True,
+            "slack": {
+                "enabled": True,
+                "webhook_url": "http://u",
+                "events": ["runner_started"],
+                "templates": {
+                    "runner_started": {
+                        "title": "Runner {runner_id}",
+                        "text": "Hello {runner_id}",
+                        "fields": [{"name": "id", "value": "{runner_id}"}],
+                    }
+                },
+            },
+        }
+    )
+
+    def no_recompile(*a, **k):
+        raise AssertionError("template should not be compiled per notification")
+
+    sent = []
+    monkeypatch.setattr(svc, "_compile_slack_payload", no_recompile)
+    monkeypatch.setattr(
+        svc, "_send_with_retry", lambda url, payload, cfg: sent.append(payload) or True
+    )
+    assert svc.notify_sync("runner_started", {"runner_id": "X"}) == {"slack": True}
+    assert svc.notify_sync("runner_started", {"runner_id": "Y"}) == {"slack": True}
+    titles = [p["attachments"][0]["title"] for p in sent]
+    assert titles == ["Runner X", "Runner Y"]
+    assert sent[0]["attachments"][0]["fields"] == [
+        {"title": "id", "value": "X", "short": True}
+    ]
+
+
 def test_send_with_retry_success_first_try(monkeypatch, service):
 
     class Resp:
@@ -140,7 +395,7 @@ def test_send_with_retry_success_first_try(monkeypatch, service):
         calls["n"] += 1
         return Resp()
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
     svc = service({"enabled": True})
     assert svc._send_with_retry("http://u", payload={}, config={}) is True
     assert calls["n"] == 1
@@ -161,7 +416,7 @@ def test_send_with_retry_retry_then_success(monkeypatch, service):
     def fake_post(*a, **k):
         return seq.pop(0)
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
     monkeypatch.setattr("time.sleep", lambda *a, **k: None)
     svc = service({"enabled": True})
     assert svc._send_with_retry("http://u", payload={}, config={}) is True
@@ -181,7 +436,7 @@ def test_send_with_retry_exceptions_then_success(monkeypatch, service):
             raise v
         return v
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
     monkeypatch.setattr("time.sleep", lambda *a, **k: None)
     svc = service({"enabled": True})
     assert svc._send_with_retry("http://u", payload={}, config={}) is True
@@ -202,7 +457,7 @@ def test_send_with_retry_all_fail_returns_false_and_sleeps(monkeypatch, service)
     def fake_sleep(*a, **k):
         calls["sleep"] += 1
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
     monkeypatch.setattr("time.sleep", fake_sleep)
     svc = service({"enabled": True})
     assert svc._send_with_retry("http://u", payload={}, config={}) is False
@@ -211,6 +466,29 @@ def test_send_with_retry_all_fail_returns_false_and_sleeps(monkeypatch, service)
     assert calls["sleep"] == 3
 
 
+def test_send_with_retry_backs_off_exponentially(monkeypatch, service):
+    """Test retry delays grow with the provider backoff settings and are capped."""
+
+    class Resp500:
+        status_code = 500
+        text = "err"
+
+    delays = []
+    monkeypatch.setattr("requests.Session.post", lambda *a, **k: Resp500())
+    monkeypatch.setattr("time.sleep", delays.append)
+    svc = service({"enabled": True, "retry_count": 4})
+    cfg = {"backoff": {"initial_ms": 100, "multiplier": 3, "max_ms": 1000}}
+    assert svc._send_with_retry("http://u", payload={}, config=cfg) is False
+    assert delays == pytest.approx([0.1, 0.3, 0.9, 1.0])
+
+
+@pytest.mark.parametrize("backoff", [None, {}])
+def test_backoff_delay_defaults_to_retry_delay(service, backoff):
+    svc = service({"enabled": True, "retry_delay": 5})
+    delays = [svc._backoff_delay(i, {"backoff": backoff}) for i in range(5)]
+    assert delays == [5, 10, 20, 40, 60]
+
+
 def test_send_with_retry_try_sleep_branch_loops(monkeypatch, service):
     # Force 500 twice with retry_count=1 so we sleep once and loop exactly once
     class Resp500:
@@ -227,7 +505,7 @@ def test_send_with_retry_try_sleep_branch_loops(monkeypatch, service):
     def fake_sleep(*a, **k):
         calls["sleep"] += 1
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
     monkeypatch.setattr("time.sleep", fake_sleep)
     svc = service({"enabled": True})
     svc.retry_count = 1
@@ -247,7 +525,7 @@ def test_send_with_retry_try_backedge_without_sleep_patch(monkeypatch, service):
     def fake_post(*a, **k):
         return seq.pop(0)
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
     svc = service({"enabled": True})
     svc.retry_count = 1
     svc.retry_delay = 0
@@ -271,7 +549,7 @@ def test_send_with_retry_exception_branch(monkeypatch, service):
     def fake_sleep(*a, **k):
         pass
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
     monkeypatch.setattr("time.sleep", fake_sleep)
 
     # Create service with minimal retries
@@ -296,7 +574,7 @@ def test_send_with_retry_uses_provider_timeout_override(monkeypatch, service):
         captured["timeout"] = k.get("timeout")
         return Resp()
 
-    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
     svc = service({"enabled": True})
     assert svc._send_with_retry("http://u", payload={}, config={"timeout": 1}) is True
     assert captured["timeout"] == 1
@@ -481,6 +759,7 @@ def test_notify_failure_prints_error(monkeypatch):
     svc = WebhookService(
         {
             "enabled": True,
+            "verbose_console": True,
             "slack": {
                 "enabled": True,
                 "webhook_url": "http://u",
@@ -491,13 +770,32 @@ def test_notify_failure_prints_error(monkeypatch):
     )
     # Force failure of send
     monkeypatch.setattr(svc, "_send_notification", lambda *a, **k: False)
-    res = svc.notify("evt", {"x": 1})
+    res = svc.notify_sync("evt", {"x": 1})
     assert res == {"slack": False}
     assert any("Failed to send notification" in str(m) for m in messages)
 
     # Removed duplicate, unindented function definition
 
 
+def test_delivery_status_logged_not_printed_by_default(monkeypatch, caplog):
+    """Test delivery status goes to the logger unless verbose_console is set."""
+    messages = []
+    console = types.SimpleNamespace(print=lambda *a, **k: messages.append(a))
+    svc = WebhookService(
+        {
+            "enabled": True,
+            "slack": {"enabled": True, "webhook_url": "http://u", "events": ["evt"]},
+        },
+        console=console,
+    )
+    messages.clear()
+    monkeypatch.setattr(svc, "_send_notification", lambda *a, **k: True)
+    with caplog.at_level("INFO", logger="src.services.webhook_service"):
+        assert svc.notify_sync("evt", {}) == {"slack": True}
+    assert messages == []
+    assert "Notification evt sent to slack" in caplog.text
+
+
 def test_send_notification_exception_returns_false(monkeypatch, service):
     svc = service({"enabled": True})
 
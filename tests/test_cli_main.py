@@ -1,28 +1,26 @@
-from typer.testing import CliRunner
-
 import src.presentation.cli.main as cli_main
 
-cli = CliRunner()
-
 
-def test_hello():
+def test_hello(cli):
     result = cli.invoke(cli_main.app, ["hello", "--name", "Test"])
     assert result.exit_code == 0
     assert "Hello, Test!" in result.stdout
 
 
-def test_status():
+def test_status(cli):
     result = cli.invoke(cli_main.app, ["status"])
     assert result.exit_code == 0
-    assert "Checking GitHub runners status" in result.stdout
-    assert "All runners are healthy" in result.stdout
+    stdout = result.stdout
+    assert "Checking GitHub runners status" in stdout
+    assert "All runners are healthy" in stdout
 
 
-def test_list():
+def test_list(cli):
     result = cli.invoke(cli_main.app, ["list"])
     assert result.exit_code == 0
-    assert "Listing GitHub runners" in result.stdout
-    assert "No runners configured yet" in result.stdout
+    stdout = result.stdout
+    assert "Listing GitHub runners" in stdout
+    assert "No runners configured yet" in stdout
 
 
 def test_main_entrypoint(monkeypatch):
@@ -1,3 +1,4 @@
+import os
 import tempfile
 from pathlib import Path
 
@@ -33,6 +34,50 @@ def test_load_config_file_not_found():
         service.load_config()
 
 
+def test_load_config_cached_until_file_changes(config_file, valid_config):
+    service = ConfigService(config_file)
+    config = service.load_config()
+    assert service.load_config() is config
+
+    data = valid_config.model_dump(mode="json")
+    data["runners"][0]["nb"] = 5
+    with open(config_file, "w") as f:
+        yaml.dump(data, f)
+    reloaded = service.load_config()
+    assert reloaded is not config
+    assert reloaded.runners[0].nb == 5
+
+
+def test_load_config_reloads_replaced_file_with_same_size_and_mtime(
+    config_file, valid_config
+):
+    """A same-size rewrite within one mtime tick is caught by the new inode."""
+    service = ConfigService(config_file)
+    config = service.load_config()
+    before = os.stat(config_file)
+
+    text = Path(config_file).read_text().replace("2.300.0", "2.300.1")
+    tmp = Path(config_file + ".tmp")
+    tmp.write_text(text)
+    os.utime(tmp, ns=(before.st_atime_ns, before.st_mtime_ns))
+    os.replace(tmp, config_file)
+    assert os.stat(config_file).st_size == before.st_size
+
+    reloaded = service.load_config()
+    assert reloaded is not config
+    assert reloaded.runners_defaults.base_image.endswith(":2.300.1")
+
+
+def test_save_config_invalidates_cache(config_file, valid_config):
+    service = ConfigService(config_file)
+    config = service.load_config()
+    updated = valid_config.model_copy(deep=True)
+    updated.runners[0].nb = 7
+    service.save_config(updated)
+    assert service.load_config() is not config
+    assert service.load_config().runners[0].nb == 7
+
+
 def test_load_config_empty_file(tmp_path):
     empty_path = tmp_path / "empty.yaml"
     with open(empty_path, "w") as f: